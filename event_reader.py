@@ -1,18 +1,5 @@
-import json
-import pandas as pd
+from waste_route.events import convert_event_json
 
-# Load the JSON file
-file_path = r"Data/event_data.json"  # Replace with your JSON file path
-with open(file_path, 'r') as file:
-    json_data = json.load(file)
-
-# Convert JSON data to a DataFrame
-if isinstance(json_data, list):  # Ensure the JSON data is a list of records
-    df = pd.DataFrame(json_data)
-
-    # Save the DataFrame to an Excel file in the Output folder
-    output_path = r"Output/event_data.xlsx"
-    df.to_excel(output_path, index=False)
-    print(f"✅ JSON data successfully saved to {output_path}")
-els e:
-    print("❌ The JSON data is not in a tabular format suitable for a DataFrame.")
\ No newline at end of file
+# Same as `python -m waste_route read-events`
+if __name__ == "__main__":
+    convert_event_json(r"Data/event_data.json", r"Output/event_data.xlsx")
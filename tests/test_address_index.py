@@ -0,0 +1,22 @@
+import pandas as pd
+
+from waste_route.address_index import combine_address_index, load_address_index
+
+
+def test_repeated_addresses_accumulate_samples():
+    old = pd.DataFrame({'address_key': ['a', 'b'], 'latitude': [52.0, 50.0],
+                        'longitude': [5.0, 4.0], 'samples': [3, 1]})
+    new = pd.DataFrame({'address_key': ['a', 'c'], 'latitude': [52.4, 49.0],
+                        'longitude': [5.4, 3.0], 'samples': [1, 2]})
+    combined = combine_address_index(old, new).set_index('address_key')
+
+    assert combined['samples'].to_dict() == {'a': 4, 'b': 1, 'c': 2}
+    assert combined.loc['a', 'latitude'] == 52.1
+    assert combined.loc['a', 'longitude'] == 5.1
+
+
+def test_combine_with_missing_index_keeps_new_batch():
+    new = pd.DataFrame({'address_key': ['a'], 'latitude': [52.0], 'longitude': [5.0], 'samples': [2]})
+    combined = combine_address_index(load_address_index('missing_index.xlsx'), new)
+    assert combined['latitude'].dtype == float
+    assert combined.to_dict('records') == new.to_dict('records')
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+from waste_route.data_quality import count_events_in_windows
+
+
+def to_ns(values):
+    return pd.to_datetime(pd.Series(values)).values.astype('datetime64[ns]').astype('int64')
+
+
+def reference_counts(event_data, windows):
+    """The original per-record isin + boolean-mask check"""
+    asset_counts, time_counts = [], []
+    for _, window in windows.iterrows():
+        matching_events = event_data[event_data['asset_id'].isin([window['asset']])]
+        time_matches = matching_events[
+            (matching_events['occurred_at'] >= window['start']) &
+            (matching_events['occurred_at'] <= window['end'])
+            ]
+        asset_counts.append(len(matching_events))
+        time_counts.append(len(time_matches))
+    return np.array(asset_counts), np.array(time_counts)
+
+
+def check(event_data, windows):
+    expected = reference_counts(event_data, windows)
+    actual = count_events_in_windows(
+        event_data['asset_id'].to_numpy(), to_ns(event_data['occurred_at']),
+        windows['asset'].to_numpy(), to_ns(windows['start']), to_ns(windows['end']))
+    np.testing.assert_array_equal(actual[0], expected[0])
+    np.testing.assert_array_equal(actual[1], expected[1])
+
+
+def test_windows_outside_event_range():
+    event_data = pd.DataFrame({
+        'asset_id': ['a', 'a', 'b'],
+        'occurred_at': pd.to_datetime(['2025-01-01 08:00', '2025-01-01 09:00', '2025-01-02 08:00']),
+    })
+    windows = pd.DataFrame({
+        'asset': ['a', 'a', 'a', 'a', 'a', 'b', 'c'],
+        'start': pd.to_datetime(['2024-01-01 00:00', '2025-01-01 08:00', pd.NaT, '2024-01-01 00:00',
+                                 '2025-01-03 00:00', '2025-01-02 09:00', '2025-01-01 00:00']),
+        'end': pd.to_datetime(['2024-02-01 00:00', '2025-01-01 08:00', '2025-01-02 00:00', pd.NaT,
+                               '2025-01-04 00:00', '2025-01-02 07:00', '2025-01-02 00:00']),
+    })
+    check(event_data, windows)
+
+
+def test_random_windows_match_reference():
+    rng = np.random.default_rng(0)
+    base = pd.Timestamp('2025-01-01')
+    event_data = pd.DataFrame({
+        'asset_id': rng.choice(['a', 'b', 'c'], 500),
+        'occurred_at': base + pd.to_timedelta(rng.integers(0, 3 * 86400, 500), unit='s'),
+    })
+    starts = base + pd.to_timedelta(rng.integers(-86400, 4 * 86400, 200), unit='s')
+    windows = pd.DataFrame({
+        'asset': rng.choice(['a', 'b', 'c', 'd'], 200),
+        'start': starts,
+        'end': starts + pd.to_timedelta(rng.integers(-3600, 12 * 3600, 200), unit='s'),
+    })
+    check(event_data, windows)
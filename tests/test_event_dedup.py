@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+from waste_route.event_dedup import dedup_and_sort_events
+
+
+def test_null_asset_rows_are_kept_and_sorted_last():
+    df = pd.DataFrame({
+        'asset_id': ['b', None, 'a', 'b'],
+        'occurred_at': ['2025-01-31T09:02:41.99Z', '2025-01-31T09:00:00Z',
+                        '2025-01-31T09:05:00Z', '2025-01-31T09:01:00Z'],
+        'latitude': [1.0, 2.0, 3.0, 4.0],
+    })
+    result, keys = dedup_and_sort_events(df)
+
+    assert result['asset_id'].tolist()[:3] == ['a', 'b', 'b']
+    assert pd.isna(result['asset_id'].iloc[3])
+    assert result['latitude'].tolist() == [3.0, 4.0, 1.0, 2.0]
+    assert len(keys) == 4
+
+
+def test_duplicates_dropped_within_and_across_batches():
+    df = pd.DataFrame({
+        'asset_id': ['a', 'a', 'a'],
+        'occurred_at': ['2025-01-31T09:02:41.99Z', '2025-01-31T09:02:41.990Z', '2025-01-31T09:03:00Z'],
+    })
+    result, keys = dedup_and_sort_events(df)
+    assert len(result) == 2
+
+    again, _ = dedup_and_sort_events(df, keys)
+    assert len(again) == 0
+    assert np.all(np.diff(keys.astype(np.float64)) >= 0)
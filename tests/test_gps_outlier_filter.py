@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+from waste_route.gps_outlier_filter import flag_gps_outliers
+
+
+def track(lat, asset='a'):
+    return pd.DataFrame({'asset_id': asset, 'latitude': lat, 'longitude': 5.0,
+                         'occurred_at': pd.date_range('2025-01-01', periods=len(lat), freq='30s')})
+
+
+GOOD = list(52.0 + np.arange(10) * 0.001)
+
+
+def flags(df):
+    return flag_gps_outliers(df, 'latitude', 'longitude', 'occurred_at').astype(int).tolist()
+
+
+def test_cluster_at_track_start_is_flagged():
+    assert flags(track([55.0, 55.0005] + GOOD)) == [1, 1] + [0] * 10
+    assert flags(track([55.0, 60.0] + GOOD)) == [1, 1] + [0] * 10
+
+
+def test_cluster_at_track_end_does_not_flag_the_track():
+    assert flags(track(GOOD + [55.0, 55.0005])) == [0] * 12
+
+
+def test_track_start_is_per_asset():
+    df = pd.concat([track(GOOD[:6]), track([55.0, 55.0005] + GOOD[:4], asset='b')], ignore_index=True)
+    assert flags(df) == [0] * 6 + [1, 1] + [0] * 4
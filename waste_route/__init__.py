@@ -0,0 +1,48 @@
+"""
+Waste route optimisation: CW, Perform and Event data processing.
+
+Submodules are imported on first attribute access, so `import waste_route`
+doesn't load pandas, numpy or scipy until a function is actually used.
+"""
+import importlib
+
+
+_EXPORTS = {
+    'extract_flc_arc': 'cw_extract',
+    'extract_cw_file': 'cw_extract',
+    'load_cw_exports': 'cw_loader',
+    'get_coordinates': 'geocoding',
+    'geocode_missing': 'geocoding',
+    'geocode_cw_file': 'geocoding',
+    'build_address_index': 'address_index',
+    'fill_coordinates_from_index': 'address_index',
+    'normalize_perform_times': 'perform',
+    'read_event_json': 'events',
+    'dedup_and_sort_events': 'event_dedup',
+    'filter_gps_outliers': 'gps_outlier_filter',
+    'interpolate_by_groups': 'interpolation',
+    'process_excel_file': 'interpolation',
+    'compute_fuel_for_cw': 'fuel',
+    'merge_fuel_into_cw': 'fuel',
+    'merge_performance_event_data': 'event_merge',
+    'fuse_tour_data': 'fusion',
+    'build_event_store': 'event_store',
+    'EventStore': 'event_store',
+    'StreamEnricher': 'event_stream',
+    'profile_tables': 'data_quality',
+    'FuelGrid': 'fuel_grid',
+    'TravelTimeMatrix': 'travel_time_matrix',
+    'score_sequences': 'tour_scoring',
+    'detect_episodes': 'idling',
+    'attach_cw_segments': 'idling',
+    'FuelCurve': 'fuel_attribution',
+    'attribute_event_fuel': 'fuel_attribution',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
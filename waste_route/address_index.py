@@ -0,0 +1,90 @@
+import os
+import pandas as pd
+
+
+ADDRESS_COL = 'clientAddress'
+LAT_COL = 'completionLatitude'
+LON_COL = 'completionLongitude'
+
+INDEX_DTYPES = {'address_key': object, 'latitude': float, 'longitude': float, 'samples': int}
+
+
+def normalize_address(addresses):
+    """Vectorized address normalisation so spelling variants share one key"""
+    return (addresses.astype(str)
+            .str.lower()
+            .str.replace('ß', 'ss', regex=False)
+            .str.replace(r'(stra?sse|str)\b\.?', 'str', regex=True)
+            .str.replace(r'[^\w\s]', ' ', regex=True)
+            .str.replace(r'\s+', ' ', regex=True)
+            .str.strip())
+
+
+def missing_coordinates(df, lat_col=LAT_COL, lon_col=LON_COL):
+    """Rows whose completion coordinates are missing or zero"""
+    return (df[lat_col].isna() | df[lon_col].isna() |
+            (df[lat_col] == 0) | (df[lon_col] == 0))
+
+
+def build_address_index(df, address_col=ADDRESS_COL, lat_col=LAT_COL, lon_col=LON_COL):
+    """
+    Median completion coordinates and sample count per normalised address
+    """
+    valid = df[~missing_coordinates(df, lat_col, lon_col) & df[address_col].notna()]
+
+    index = (valid.assign(address_key=normalize_address(valid[address_col]))
+             .groupby('address_key')
+             .agg(latitude=(lat_col, 'median'),
+                  longitude=(lon_col, 'median'),
+                  samples=(lat_col, 'size'))
+             .reset_index())
+
+    print(f"Address index covers {len(index):,} addresses from {len(valid):,} completions")
+    return index
+
+
+def combine_address_index(old_index, new_index):
+    """
+    Merge two indices into the historical aggregate: samples add up and the
+    coordinates are the sample-weighted mean of each index's location
+    """
+    combined = pd.concat([old_index, new_index], ignore_index=True)
+    # An empty index from load_address_index has object columns; keep the coordinates numeric
+    combined = combined.astype(INDEX_DTYPES)
+
+    weighted = combined.assign(latitude=combined['latitude'] * combined['samples'],
+                               longitude=combined['longitude'] * combined['samples'])
+    totals = weighted.groupby('address_key', sort=False)[['latitude', 'longitude', 'samples']].sum()
+    totals['latitude'] /= totals['samples']
+    totals['longitude'] /= totals['samples']
+    return totals.reset_index().astype(INDEX_DTYPES)
+
+
+def load_address_index(index_file):
+    """Load a saved index, or an empty one if it does not exist yet"""
+    if os.path.exists(index_file):
+        return pd.read_excel(index_file)
+    return pd.DataFrame(columns=list(INDEX_DTYPES)).astype(INDEX_DTYPES)
+
+
+def fill_coordinates_from_index(df, index, address_col=ADDRESS_COL, lat_col=LAT_COL,
+                                lon_col=LON_COL, min_samples=1):
+    """
+    Fill missing or zero coordinates from the index with one vectorized join.
+    Rows for addresses that are not in the index are left for the geocoder.
+    """
+    df_work = df.copy()
+    missing = missing_coordinates(df_work, lat_col, lon_col)
+
+    lookup = index[index['samples'] >= min_samples].set_index('address_key')
+    keys = normalize_address(df_work.loc[missing, address_col])
+
+    lat = keys.map(lookup['latitude'])
+    lon = keys.map(lookup['longitude'])
+    found = lat.notna() & lon.notna()
+
+    df_work.loc[found[found].index, lat_col] = lat[found]
+    df_work.loc[found[found].index, lon_col] = lon[found]
+
+    print(f"Filled {found.sum():,} of {missing.sum():,} missing coordinates from the address index")
+    return df_work
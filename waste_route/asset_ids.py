@@ -0,0 +1,55 @@
+import ast
+import pandas as pd
+
+
+def parse_asset_ids(asset_id_str):
+    """
+    Parse asset IDs from string format like "['id1', 'id2']" to list
+    """
+    try:
+        if pd.isna(asset_id_str):
+            return []
+
+        if isinstance(asset_id_str, str):
+            # Clean the string and handle different formats
+            cleaned = asset_id_str.strip()
+
+            # Handle string representation of list like "['id1', 'id2']"
+            if cleaned.startswith("['") and cleaned.endswith("']"):
+                try:
+                    return ast.literal_eval(cleaned)
+                except:
+                    # If ast fails, try manual parsing
+                    cleaned = cleaned[2:-2]  # Remove [' and ']
+                    return [cleaned] if cleaned else []
+
+            # Handle list format like ['id1', 'id2']
+            elif cleaned.startswith('[') and cleaned.endswith(']'):
+                try:
+                    return ast.literal_eval(cleaned)
+                except:
+                    # Manual parsing fallback
+                    cleaned = cleaned[1:-1]  # Remove [ and ]
+                    if cleaned:
+                        # Split by comma and clean quotes
+                        ids = [id_.strip().strip("'\"") for id_ in cleaned.split(',')]
+                        return [id_ for id_ in ids if id_]
+                    return []
+
+            # Single asset ID
+            else:
+                return [cleaned]
+
+        # If it's already a list or other type
+        return asset_id_str if isinstance(asset_id_str, list) else [str(asset_id_str)]
+
+    except Exception as e:
+        print(f"Error parsing asset ID '{asset_id_str}': {e}")
+        return []
+
+
+def first_asset_id(series):
+    """First asset ID of every value of a column, parsing each distinct value only once"""
+    text = series.astype(str)
+    parsed = {value: (parse_asset_ids(value) or [None])[0] for value in text[series.notna()].unique()}
+    return text.map(parsed).where(series.notna())
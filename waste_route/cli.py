@@ -0,0 +1,301 @@
+import argparse
+import warnings
+
+
+# Every command imports its module (and with it pandas, numpy, ...) only when it runs,
+# so `python -m waste_route --help` starts without loading any data libraries
+
+
+def cmd_extract_cw(args):
+    from .cw_extract import extract_cw_file
+    extract_cw_file(args.input, args.output)
+
+
+def cmd_load_cw(args):
+    from .cw_loader import load_cw_exports
+    cw_df = load_cw_exports(args.source, max_workers=args.workers)
+    cw_df.to_excel(args.output, index=False)
+
+
+def cmd_geocode(args):
+    from .geocoding import geocode_cw_file
+    geocode_cw_file(args.input, args.output, args.index)
+
+
+def cmd_address_index(args):
+    import pandas as pd
+    from .address_index import build_address_index, combine_address_index, load_address_index
+
+    address_index = combine_address_index(load_address_index(args.index), build_address_index(pd.read_excel(args.input)))
+    address_index.to_excel(args.index, index=False)
+    print(f"✅ Address index saved to {args.index}")
+
+
+def cmd_perform_times(args):
+    from .perform import normalize_perform_file
+    normalize_perform_file(args.input, args.output)
+
+
+def cmd_read_events(args):
+    from .events import convert_event_json
+    convert_event_json(args.input, args.output)
+
+
+def cmd_dedup_events(args):
+    from .event_dedup import process_event_batch
+    process_event_batch(args.input, args.output, args.index)
+
+
+def cmd_filter_gps(args):
+    import pandas as pd
+    from .gps_outlier_filter import filter_gps_outliers
+
+    result_df = filter_gps_outliers(pd.read_excel(args.input), 'latitude', 'longitude', 'occurred_at')
+    result_df.to_excel(args.output, index=False)
+    print(f"✅ Saved filtered events to {args.output}")
+
+
+def cmd_interpolate(args):
+    from .interpolation import process_excel_file
+    process_excel_file(args.input, args.output)
+
+
+def cmd_fuel(args):
+    from .fuel import compute_fuel_for_cw
+    compute_fuel_for_cw(cw_file=args.cw, perform_file=args.perform, output_file=args.output)
+
+
+def cmd_merge_events(args):
+    from .event_merge import merge_performance_event_data
+
+    result = merge_performance_event_data(args.perform, args.events, args.output)
+
+    print("\n" + "=" * 50)
+    print("MERGE COMPLETED SUCCESSFULLY!" if result is not None else "MERGE FAILED - CHECK ERROR MESSAGES ABOVE")
+    print("=" * 50)
+
+
+def cmd_fuse(args):
+    from .fusion import fuse_tour_data
+    fuse_tour_data(args.cw, args.perform, args.events, args.output)
+
+
+def cmd_build_store(args):
+    import pandas as pd
+    from .event_store import build_event_store
+    build_event_store(pd.read_excel(args.input), args.store)
+
+
+def cmd_serve(args):
+    from .tour_query_service import serve, TABLE_FILES
+    table_files = dict(TABLE_FILES, fused=args.fused, cw=args.cw)
+    serve(table_files, host=args.host, port=args.port)
+
+
+def cmd_stream(args):
+    import asyncio
+    import pandas as pd
+    from .event_stream import StreamEnricher, run_stream, socket_events, tail_file
+
+    enricher = StreamEnricher(pd.read_excel(args.cw), pd.read_excel(args.perform))
+    source = socket_events(port=args.port) if args.socket else tail_file(args.events, from_start=args.from_start)
+    try:
+        asyncio.run(run_stream(source, enricher))
+    except KeyboardInterrupt:
+        pass
+
+
+def cmd_profile(args):
+    import pandas as pd
+    from .data_quality import profile_tables, write_report
+
+    report = profile_tables(pd.read_excel(args.cw), pd.read_excel(args.perform), pd.read_excel(args.events))
+    write_report(report, args.output)
+
+
+def cmd_fuel_grid(args):
+    import os
+    import pandas as pd
+    from .fuel_grid import FuelGrid, apportion_event_fuel
+
+    curve = None
+    if args.perform:
+        from .fuel_attribution import FuelCurve
+        curve = FuelCurve.from_perform(pd.read_excel(args.perform))
+
+    grid = FuelGrid.load(args.grid) if os.path.exists(args.grid) else FuelGrid()
+    grid.update(apportion_event_fuel(pd.read_excel(args.input), curve=curve))
+    grid.save(args.grid)
+
+    with pd.ExcelWriter(args.output) as writer:
+        grid.hot_spots(level=args.level, by='fuel').to_excel(writer, sheet_name='fuel', index=False)
+        grid.hot_spots(level=args.level, by='idle_seconds').to_excel(writer, sheet_name='idling', index=False)
+    print(f"✅ Fuel hot spots saved to {args.output}")
+
+
+def cmd_travel_matrix(args):
+    import pandas as pd
+    from .travel_time_matrix import TravelTimeMatrix
+
+    matrix = TravelTimeMatrix.from_cw(pd.read_excel(args.input))
+    matrix.save(args.output)
+    print(f"✅ Travel time matrix saved to {args.output}")
+
+
+def cmd_score_tours(args):
+    import pandas as pd
+    from .tour_scoring import historical_fuel_per_km, random_candidates, score_tours, tour_inputs
+    from .travel_time_matrix import load_or_build_matrix
+
+    cw_df = pd.read_excel(args.cw)
+    cw_df['start'] = pd.to_datetime(cw_df['start'])
+
+    matrix = load_or_build_matrix(cw_df, args.matrix, source_file=args.cw)
+    fuel_per_km = historical_fuel_per_km(cw_df)
+
+    jobs = []
+    for tour_no in cw_df['tourNo'].dropna().unique():
+        inputs = tour_inputs(cw_df, tour_no, matrix, fuel_per_km)
+        jobs.append((inputs, random_candidates(len(inputs['historical_order']), args.candidates)))
+
+    scores = score_tours(jobs, max_workers=args.workers)
+    best = scores.loc[scores.groupby('tourNo')['fuel'].idxmin()]
+    best.to_excel(args.output, index=False)
+    print(f"✅ Scored {len(scores):,} candidate sequences for {len(jobs)} tours")
+
+
+def cmd_idling(args):
+    from .idling import detect_idling_file
+    detect_idling_file(args.events, args.cw, args.perform, args.output)
+
+
+def cmd_event_fuel(args):
+    from .fuel_attribution import attribute_event_fuel_file
+    attribute_event_fuel_file(args.events, args.perform, args.output, args.curve)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='waste_route', description='Waste route data processing')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def command(name, func, help):
+        sub = commands.add_parser(name, help=help)
+        sub.set_defaults(func=func)
+        return sub
+
+    sub = command('extract-cw', cmd_extract_cw, 'extract FLC/ARC rows from a CW export')
+    sub.add_argument('--input', default=r"Data/CW-export_2.25.xlsx")
+    sub.add_argument('--output', default=r"extracted_FLC_ARC_data.xlsx")
+
+    sub = command('load-cw', cmd_load_cw, 'load and combine many CW exports in parallel')
+    sub.add_argument('--source', default=r"Data/CW-export_*.xlsx", help='directory or glob')
+    sub.add_argument('--output', default=r"Output/cw_combined.xlsx")
+    sub.add_argument('--workers', type=int, default=None)
+
+    sub = command('geocode', cmd_geocode, 'fill missing CW coordinates (address index, then Geoapify)')
+    sub.add_argument('--input', default=r"Data/CW-export_2.25.xlsx")
+    sub.add_argument('--output', default=r"Output/latilong.xlsx")
+    sub.add_argument('--index', default=r"Output/address_index.xlsx")
+
+    sub = command('address-index', cmd_address_index, 'update the address-to-coordinate index')
+    sub.add_argument('--input', default=r"extracted_FLC_ARC_data.xlsx")
+    sub.add_argument('--index', default=r"Output/address_index.xlsx")
+
+    sub = command('perform-times', cmd_perform_times, 'normalise Perform timestamps')
+    sub.add_argument('--input', default=r"Output/perform.xlsx")
+    sub.add_argument('--output', default=r"updated_filtered_matching_data.xlsx")
+
+    sub = command('read-events', cmd_read_events, 'convert the event JSON export to Excel')
+    sub.add_argument('--input', default=r"Data/event_data.json")
+    sub.add_argument('--output', default=r"Output/event_data.xlsx")
+
+    sub = command('dedup-events', cmd_dedup_events, 'drop duplicate events of a new batch')
+    sub.add_argument('--input', default=r"Output/event_data.xlsx")
+    sub.add_argument('--output', default=r"Output/event_dedup.xlsx")
+    sub.add_argument('--index', default=r"Output/event_seen_index.npy")
+
+    sub = command('filter-gps', cmd_filter_gps, 'blank out implausible GPS fixes')
+    sub.add_argument('--input', default=r"Output/event_dedup.xlsx")
+    sub.add_argument('--output', default=r"Output/event_gps_filtered.xlsx")
+
+    sub = command('interpolate', cmd_interpolate, 'interpolate missing event coordinates')
+    sub.add_argument('--input', default=r"Output/event_data_10000_snippet.xlsx")
+    sub.add_argument('--output', default=r"Output/event_snippet_10000_interpolated.xlsx")
+
+    sub = command('fuel', cmd_fuel, 'apportion Perform fuel to CW rows')
+    sub.add_argument('--cw', default=r"Output/cw_cleaned.xlsx")
+    sub.add_argument('--perform', default=r"Output/perform_datetime.xlsx")
+    sub.add_argument('--output', default=r"CW_Updated.xlsx")
+
+    sub = command('merge-events', cmd_merge_events, 'merge events into CW-Perform intervals')
+    sub.add_argument('--perform', default=r"cw_perform_merged.xlsx")
+    sub.add_argument('--events', default=r"Output/event_interpolated.xlsx")
+    sub.add_argument('--output', default=r"perform_event_merged.xlsx")
+
+    sub = command('fuse', cmd_fuse, 'fuse CW, Perform and Event data')
+    sub.add_argument('--cw', default=r"cw_cleaned.xlsx")
+    sub.add_argument('--perform', default=r"perform_datetime.xlsx")
+    sub.add_argument('--events', default=r"event_interpolated.xlsx")
+    sub.add_argument('--output', default=r"cw_perform_event.xlsx")
+
+    sub = command('build-store', cmd_build_store, 'build the memory-mapped event store')
+    sub.add_argument('--input', default=r"Output/event_interpolated.xlsx")
+    sub.add_argument('--store', default=r"Output/event_store")
+
+    sub = command('serve', cmd_serve, 'serve fused tour data over local HTTP')
+    sub.add_argument('--fused', default=r"cw_perform_event.xlsx")
+    sub.add_argument('--cw', default=r"CW_Updated.xlsx")
+    sub.add_argument('--host', default='127.0.0.1')
+    sub.add_argument('--port', type=int, default=8050)
+
+    sub = command('stream', cmd_stream, 'enrich events as they arrive')
+    sub.add_argument('--cw', default=r"Output/cw_cleaned.xlsx")
+    sub.add_argument('--perform', default=r"Output/perform_datetime.xlsx")
+    sub.add_argument('--events', default=r"Output/event_stream.jsonl")
+    sub.add_argument('--socket', action='store_true', help='read from a local socket instead of the file')
+    sub.add_argument('--from-start', action='store_true', help='replay the events already in the file first')
+    sub.add_argument('--port', type=int, default=8765)
+
+    sub = command('profile', cmd_profile, 'write a data quality report')
+    sub.add_argument('--cw', default=r"Output/cw_cleaned.xlsx")
+    sub.add_argument('--perform', default=r"Output/perform_datetime.xlsx")
+    sub.add_argument('--events', default=r"Output/event_interpolated.xlsx")
+    sub.add_argument('--output', default=r"Output/data_quality_report.json")
+
+    sub = command('fuel-grid', cmd_fuel_grid, 'aggregate fuel and idling per grid cell')
+    sub.add_argument('--input', default=r"cw_perform_event.xlsx")
+    sub.add_argument('--grid', default=r"Output/fuel_grid.npz")
+    sub.add_argument('--output', default=r"Output/fuel_hot_spots.xlsx")
+    sub.add_argument('--level', type=int, default=2)
+    sub.add_argument('--perform', default=None, help='attribute fuel per event interval from this Perform file')
+
+    sub = command('travel-matrix', cmd_travel_matrix, 'learn the stop-to-stop travel time matrix')
+    sub.add_argument('--input', default=r"Output/latilong.xlsx")
+    sub.add_argument('--output', default=r"Output/travel_time_matrix.npz")
+
+    sub = command('score-tours', cmd_score_tours, 'score alternative stop orders of every tour')
+    sub.add_argument('--cw', default=r"CW_Updated.xlsx")
+    sub.add_argument('--matrix', default=r"Output/travel_time_matrix.npz")
+    sub.add_argument('--output', default=r"Output/tour_scores.xlsx")
+    sub.add_argument('--candidates', type=int, default=1000)
+    sub.add_argument('--workers', type=int, default=None)
+
+    sub = command('idling', cmd_idling, 'detect idling and stop episodes per CW segment')
+    sub.add_argument('--events', default=r"Output/event_interpolated.xlsx")
+    sub.add_argument('--cw', default=r"Output/cw_cleaned.xlsx")
+    sub.add_argument('--perform', default=r"Output/perform_datetime.xlsx")
+    sub.add_argument('--output', default=r"Output/idling_episodes.xlsx")
+
+    sub = command('event-fuel', cmd_event_fuel, 'attribute Perform fuel to every event interval')
+    sub.add_argument('--events', default=r"Output/event_interpolated.xlsx")
+    sub.add_argument('--perform', default=r"Output/perform_datetime.xlsx")
+    sub.add_argument('--output', default=r"Output/event_fuel.xlsx")
+    sub.add_argument('--curve', default=r"Output/fuel_curve.npz")
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    warnings.filterwarnings('ignore')
+    args.func(args)
@@ -0,0 +1,48 @@
+import pandas as pd
+
+
+# Columns kept for routing
+CW_COLUMNS = [
+    'date', 'start', 'end', 'truck', 'clientAddress',
+    'truckId', 'containerType', 'completionLongitude', 'completionLatitude', 'tourNo'
+]
+
+# Every column of interest in a CW export
+CW_EXPORT_COLUMNS = [
+    'date', 'start', 'end', 'duration', 'employeeIds', 'drivers', 'area', 'truck', 'orderId', 'orderLink',
+    'contractId', 'siteId', 'costcenter', 'LE-KST', 'trailerCostcenter', 'costcenter-lohn', 'logisticProcess',
+    'timeAtDisposalSite', 'timeAtClient', 'enteredClientArea', 'leftClientArea', 'enterDisposalSite',
+    'leaveDisposalSite', 'estimatedDuration', 'breakDuration', 'issueWaitingTimes', 'resume', 'paused', 'tasks',
+    'issues', 'clientAddress', 'disposalSite', 'summDistance', 'credit', 'la', 'bs', 'wds_id', 'timeDifference',
+    'allRestingTime', 'allReportedResting', 'freeTimeWithoutTransport', 'restingOverrideDifference', 'summMoveTime',
+    'summStandTime', 'summCovered', 'nonOrderTime', 'approvalTime', 'netWorkingHours', 'startWorking', 'endWorking',
+    'employeeInternalIds', 'kaba-export', 'workdayApproved', 'approvalNote', 'dayCredit', 'reportedRestingTruncated',
+    'noOfOrders', 'truckId', 'deliveryId', 'contractInternalId', 'siteInternalId', 'vehicleType', 'xuId', 'deliverId',
+    'orderInternalId', 'weight', 'wasteType', 'containerType', 'initiator', 'customersInternalReference',
+    'completionLongitude', 'completionLatitude', 'leftLifterCount', 'rightLifterCount', '4wheelActionCount',
+    'tourNo', 'tourDesc'
+]
+
+
+def extract_flc_arc(df, columns=CW_COLUMNS):
+    """Keep the rows with 'FLC' or 'ARC' containers and the wanted columns of a CW export"""
+    df = df.copy()
+
+    # Clean up column names
+    df.columns = df.columns.str.strip()
+
+    # Filter for rows where 'containerType' contains 'FLC' or 'ARC'
+    filtered_df = df[df['containerType'].astype(str).str.contains('FLC|ARC', na=False)]
+
+    return filtered_df[columns]
+
+
+def extract_cw_file(input_file, output_file, columns=CW_COLUMNS):
+    """Extract the FLC/ARC rows of one CW export to a new Excel file"""
+    df = pd.read_excel(input_file)
+    extracted_df = extract_flc_arc(df, columns)
+    print(extracted_df.head())
+
+    extracted_df.to_excel(output_file, index=False)
+    print("✅ Extracted data with 'FLC' or 'ARC' saved successfully.")
+    return extracted_df
@@ -0,0 +1,97 @@
+import os
+import re
+import glob
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+
+from .cw_extract import CW_COLUMNS
+
+
+DATETIME_COLUMNS = ['start', 'end']
+FLOAT_COLUMNS = ['completionLongitude', 'completionLatitude']
+STRING_COLUMNS = ['truck', 'clientAddress', 'containerType', 'tourNo']
+
+DEDUP_COLUMNS = ['truck', 'start', 'end', 'clientAddress', 'tourNo']
+
+# Export month in the file name, e.g. CW-export_2.25.xlsx is February 2025
+EXPORT_MONTH_PATTERN = re.compile(r'_(\d{1,2})\.(\d{2})\.xlsx$', re.IGNORECASE)
+
+
+def _column_key(name):
+    """Compare column names ignoring case, whitespace, '_' and '-'"""
+    return re.sub(r'[\s_\-]', '', str(name)).lower()
+
+
+def export_date(path):
+    """Export month parsed from the file name, falling back to the file's modification time"""
+    match = EXPORT_MONTH_PATTERN.search(os.path.basename(path))
+    if match and 1 <= int(match.group(1)) <= 12:
+        return pd.Timestamp(year=2000 + int(match.group(2)), month=int(match.group(1)), day=1)
+    return pd.Timestamp(os.path.getmtime(path), unit='s')
+
+
+def read_cw_export(path, columns=CW_COLUMNS, container_pattern='FLC|ARC'):
+    """
+    Read one CW export, keep only FLC/ARC rows and the wanted columns.
+    Column names that drifted between months are mapped back to the canonical names.
+    """
+    wanted = {_column_key(col): col for col in columns}
+
+    df = pd.read_excel(path, usecols=lambda name: _column_key(name) in wanted or
+                       _column_key(name) == _column_key('containerType'))
+    df = df.rename(columns=lambda name: wanted.get(_column_key(name), name.strip()))
+    df = df.loc[:, ~df.columns.duplicated()]
+
+    df = df[df['containerType'].astype(str).str.contains(container_pattern, na=False)]
+
+    # Columns a month didn't export are added empty so every file has one schema
+    df = df.reindex(columns=columns)
+    df['source_file'] = os.path.basename(path)
+    return df
+
+
+def normalize_cw_types(df):
+    """Cast the combined exports to one set of dtypes"""
+    df['date'] = pd.to_datetime(df['date'], errors='coerce').dt.date
+    for col in DATETIME_COLUMNS:
+        df[col] = pd.to_datetime(df[col], errors='coerce')
+    for col in FLOAT_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    for col in STRING_COLUMNS:
+        df[col] = df[col].astype('string').str.strip()
+    df['truckId'] = pd.to_numeric(df['truckId'], errors='coerce').astype('Int64')
+    return df
+
+
+def load_cw_exports(source, columns=CW_COLUMNS, max_workers=None):
+    """
+    Load every CW export in a directory (or matching a glob) in parallel worker
+    processes and return one typed, deduplicated DataFrame
+    """
+    pattern = os.path.join(source, '*.xlsx') if os.path.isdir(source) else source
+    # Oldest export first, so dropping duplicates with keep='last' keeps the newest copy.
+    # File names are month.yy, which does not sort chronologically as text.
+    files = sorted(glob.glob(pattern), key=lambda path: (export_date(path), path))
+
+    if not files:
+        print(f"No CW exports found for {source}")
+        return pd.DataFrame(columns=columns + ['source_file'])
+
+    print(f"Loading {len(files)} CW exports...")
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        frames = list(executor.map(read_cw_export, files, [columns] * len(files)))
+
+    for path, frame in zip(files, frames):
+        print(f"  {os.path.basename(path)}: {len(frame):,} FLC/ARC rows")
+
+    df = normalize_cw_types(pd.concat(frames, ignore_index=True))
+
+    # Overlapping exports repeat rows; keep the copy from the newest export
+    dedup_columns = [col for col in DEDUP_COLUMNS if col in df.columns]
+    before = len(df)
+    df = (df.drop_duplicates(subset=dedup_columns, keep='last')
+          .sort_values(['start', 'truck'])
+          .reset_index(drop=True))
+
+    print(f"✅ Loaded {len(df):,} rows ({before - len(df):,} duplicates dropped)")
+    return df
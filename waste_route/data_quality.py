@@ -0,0 +1,176 @@
+import json
+import numpy as np
+import pandas as pd
+
+from .asset_ids import first_asset_id
+from .event_dedup import NAT_NS, to_epoch_ns
+
+
+# Gap histogram bin edges in seconds, with their labels
+GAP_BINS = [0, 60, 300, 900, 3600, 6 * 3600, 24 * 3600, np.inf]
+GAP_LABELS = ['<1m', '1-5m', '5-15m', '15m-1h', '1-6h', '6-24h', '>1d']
+
+
+def profile_table(df, name, time_cols=(), asset_col=None, lat_col=None, lon_col=None, track_time_col=None):
+    """
+    Profile one table in a single vectorized pass: null rates, zero
+    coordinates, timestamp validity, and per-asset coverage and gaps
+    """
+    total = len(df)
+    profile = {
+        'table': name,
+        'rows': total,
+        'null_rate': {col: round(float(rate), 4) for col, rate in df.isna().mean().items() if rate > 0},
+    }
+
+    if lat_col in df.columns and lon_col in df.columns:
+        lat, lon = df[lat_col], df[lon_col]
+        profile['coordinates'] = {
+            'missing': int((lat.isna() | lon.isna()).sum()),
+            'zero': int(((lat == 0) | (lon == 0)).sum()),
+            'out_of_range': int(((lat.abs() > 90) | (lon.abs() > 180)).sum()),
+        }
+
+    parsed = {}
+    profile['timestamps'] = {}
+    for col in time_cols:
+        if col not in df.columns:
+            continue
+        parsed[col] = to_epoch_ns(df[col])
+        valid = parsed[col] != NAT_NS
+        profile['timestamps'][col] = {
+            'valid': int(valid.sum()),
+            'invalid': int((df[col].notna() & ~valid).sum()),
+            'min': str(pd.Timestamp(parsed[col][valid].min())) if valid.any() else None,
+            'max': str(pd.Timestamp(parsed[col][valid].max())) if valid.any() else None,
+        }
+
+    if asset_col is not None and track_time_col in parsed:
+        assets = df[asset_col]
+        t = parsed[track_time_col]
+        keep = (t != NAT_NS) & assets.notna().to_numpy()
+        codes, uniques = pd.factorize(assets[keep])
+        t = t[keep]
+
+        # Sort once by (asset, time); gaps are the diffs inside each asset's run
+        order = np.lexsort((t, codes))
+        codes, t = codes[order], t[order]
+        same_asset = codes[1:] == codes[:-1]
+        gaps = np.diff(t)[same_asset] / 1e9
+
+        counts = np.bincount(codes, minlength=len(uniques))
+        first = np.flatnonzero(np.r_[True, ~same_asset])
+        last = np.r_[first[1:] - 1, len(t) - 1] if len(t) else first
+        span_hours = (t[last] - t[first]) / 3.6e12 if len(t) else np.empty(0)
+
+        profile['assets'] = {
+            'count': int(len(uniques)),
+            'rows_per_asset': {
+                'min': int(counts.min()) if len(counts) else 0,
+                'median': float(np.median(counts)) if len(counts) else 0,
+                'max': int(counts.max()) if len(counts) else 0,
+            },
+            'coverage_hours': {
+                'min': round(float(span_hours.min()), 2) if len(span_hours) else 0,
+                'median': round(float(np.median(span_hours)), 2) if len(span_hours) else 0,
+                'max': round(float(span_hours.max()), 2) if len(span_hours) else 0,
+            },
+            'gap_histogram': dict(zip(GAP_LABELS, np.histogram(gaps, bins=GAP_BINS)[0].tolist())),
+        }
+
+    return profile
+
+
+def asset_overlap(assets_by_table):
+    """Pairwise asset-ID overlap between tables, given a set of ids per table"""
+    names = list(assets_by_table)
+    overlap = {}
+    for i, a in enumerate(names):
+        for b in names[i + 1:]:
+            shared = assets_by_table[a] & assets_by_table[b]
+            overlap[f'{a}/{b}'] = {
+                'shared': len(shared),
+                f'only_{a}': len(assets_by_table[a] - shared),
+                f'only_{b}': len(assets_by_table[b] - shared),
+            }
+    return overlap
+
+
+def count_events_in_windows(event_assets, event_times_ns, window_assets, window_starts_ns, window_ends_ns):
+    """
+    For many (asset, start, end) windows at once, count events of that asset
+    overall and inside [start, end], using one sort and two searchsorted calls
+    """
+    codes, uniques = pd.factorize(pd.Series(event_assets))
+    valid = (codes >= 0) & (event_times_ns != NAT_NS)
+    codes, event_times_ns = codes[valid], event_times_ns[valid]
+    window_codes = pd.Index(uniques).get_indexer(pd.Series(window_assets))
+
+    # Combined sort key: asset code in the high bits, milliseconds in the low bits
+    t_min = event_times_ns.min() // 10 ** 6 if len(event_times_ns) else 0
+    key = codes.astype(np.int64) << 40 | (event_times_ns // 10 ** 6 - t_min)
+    key.sort()
+
+    lo = window_starts_ns // 10 ** 6 - t_min
+    hi = window_ends_ns // 10 ** 6 - t_min
+    # Windows ending before the first event (or with a NaT bound) hold no events;
+    # only clip windows that actually reach into the event range
+    searchable = (window_starts_ns != NAT_NS) & (window_ends_ns != NAT_NS) & (hi >= 0) & (hi >= lo)
+
+    asset_key = window_codes.astype(np.int64) << 40
+    lo_key = asset_key | np.clip(lo, 0, (1 << 40) - 1)
+    hi_key = asset_key | np.clip(hi, 0, (1 << 40) - 1)
+
+    known = window_codes >= 0
+    per_asset = np.bincount(codes, minlength=len(uniques))
+    asset_counts = np.where(known, per_asset[np.maximum(window_codes, 0)], 0)
+    in_window = np.where(known & searchable,
+                         np.searchsorted(key, hi_key, 'right') - np.searchsorted(key, lo_key, 'left'), 0)
+    return asset_counts, in_window
+
+
+def profile_tables(cw_df=None, perform_df=None, event_df=None):
+    """Profile the CW, Perform and Event tables and their asset-ID overlap"""
+    report = {'tables': [], 'asset_overlap': {}}
+    assets = {}
+    truck_names = {}
+
+    if cw_df is not None:
+        report['tables'].append(profile_table(
+            cw_df, 'cw', time_cols=['start', 'end'], asset_col='truck',
+            lat_col='completionLatitude', lon_col='completionLongitude', track_time_col='start'))
+        if 'perf_asset_ids' in cw_df.columns:
+            assets['cw'] = set(first_asset_id(cw_df['perf_asset_ids']).dropna())
+        truck_names['cw'] = set(cw_df['truck'].dropna().astype(str).str.strip())
+
+    if perform_df is not None:
+        if 'asset_ids' in perform_df.columns:
+            perform_df = perform_df.assign(asset_id=first_asset_id(perform_df['asset_ids']))
+            assets['perform'] = set(perform_df['asset_id'].dropna())
+        if 'asset_name' in perform_df.columns:
+            truck_names['perform'] = set(perform_df['asset_name'].dropna().astype(str).str.strip())
+        # Normalised Perform exports only carry the truck name
+        perform_asset_col = next((col for col in ['asset_id', 'asset_name'] if col in perform_df.columns), None)
+        report['tables'].append(profile_table(
+            perform_df, 'perform', time_cols=['result_from', 'result_to'],
+            asset_col=perform_asset_col, track_time_col='result_from'))
+
+    if event_df is not None:
+        report['tables'].append(profile_table(
+            event_df, 'event', time_cols=['occurred_at'], asset_col='asset_id',
+            lat_col='latitude', lon_col='longitude', track_time_col='occurred_at'))
+        assets['event'] = set(event_df['asset_id'].dropna().astype(str))
+
+    # CW and Perform always share the truck name (CW truck = Perform asset_name),
+    # even when the tables carry no asset IDs
+    report['asset_overlap'] = asset_overlap(assets)
+    report['asset_overlap'].update({f'{pair} (truck name)': counts
+                                    for pair, counts in asset_overlap(truck_names).items()})
+    return report
+
+
+def write_report(report, output_file):
+    """Save the profile as a compact JSON report"""
+    with open(output_file, 'w') as file:
+        json.dump(report, file, indent=1, default=str)
+    print(f"✅ Data quality report saved to {output_file}")
@@ -0,0 +1,105 @@
+import os
+import numpy as np
+import pandas as pd
+
+
+# Columns that identify a single telematics event. The id/type columns are
+# optional - whichever of them exist in the event export are used.
+ASSET_COL = 'asset_id'
+TIME_COL = 'occurred_at'
+EVENT_ID_COLS = ['id', 'event_id', 'type', 'event_type']
+
+# What to_epoch_ns returns for missing or unparseable timestamps (NaT)
+NAT_NS = np.iinfo(np.int64).min
+
+
+def to_epoch_ns(series):
+    """Parse a timestamp column to int64 nanoseconds since epoch (UTC)"""
+    occurred = pd.to_datetime(series, format='ISO8601', errors='coerce', utc=True)
+    return occurred.dt.tz_convert(None).values.astype('datetime64[ns]').astype('int64')
+
+
+def compute_event_keys(df, asset_col=ASSET_COL, time_col=TIME_COL, id_cols=None):
+    """
+    Hash (asset_id, occurred_at, event id/type) of every row into one uint64 key
+    """
+    if id_cols is None:
+        id_cols = [col for col in EVENT_ID_COLS if col in df.columns]
+
+    # Normalise the timestamp first so '...41.99Z' and '...41.990' hash the same
+    key_df = pd.DataFrame({
+        asset_col: df[asset_col].astype(str).values,
+        time_col: to_epoch_ns(df[time_col]),
+    })
+    for col in id_cols:
+        key_df[col] = df[col].astype(str).values
+
+    return pd.util.hash_pandas_object(key_df, index=False).to_numpy(dtype=np.uint64)
+
+
+def load_seen_index(index_file):
+    """Load the sorted array of event keys that were already ingested"""
+    if index_file and os.path.exists(index_file):
+        return np.load(index_file)
+    return np.empty(0, dtype=np.uint64)
+
+
+def save_seen_index(index_file, seen_keys):
+    """Persist the sorted array of ingested event keys"""
+    np.save(index_file, np.asarray(seen_keys, dtype=np.uint64))
+
+
+def is_seen(keys, seen_keys):
+    """Vectorized membership test of keys against the sorted seen index"""
+    if len(seen_keys) == 0:
+        return np.zeros(len(keys), dtype=bool)
+    pos = np.searchsorted(seen_keys, keys)
+    pos[pos == len(seen_keys)] = 0
+    return seen_keys[pos] == keys
+
+
+def dedup_and_sort_events(df, seen_keys=None, asset_col=ASSET_COL, time_col=TIME_COL, id_cols=None):
+    """
+    Drop duplicate events (within the batch and against earlier batches) and
+    return the remaining events sorted by asset and time, plus the updated index
+    """
+    if seen_keys is None:
+        seen_keys = np.empty(0, dtype=np.uint64)
+
+    keys = compute_event_keys(df, asset_col, time_col, id_cols)
+
+    # First occurrence inside this batch, and not ingested in an earlier batch
+    _, first_pos = np.unique(keys, return_index=True)
+    keep = np.zeros(len(keys), dtype=bool)
+    keep[first_pos] = True
+    keep &= ~is_seen(keys, seen_keys)
+
+    result = df.loc[keep].copy()
+
+    # One stable lexsort gives per-asset runs in time order; rows without an asset go last
+    codes, _ = pd.factorize(result[asset_col], sort=True)
+    codes = np.where(codes < 0, len(codes), codes)
+    order = np.lexsort((to_epoch_ns(result[time_col]), codes))
+    result = result.iloc[order].reset_index(drop=True)
+
+    updated_keys = np.union1d(seen_keys, keys[keep])
+
+    print(f"Dropped {len(df) - len(result):,} duplicate events, kept {len(result):,}")
+    return result, updated_keys
+
+
+def process_event_batch(input_file, output_file, index_file='Output/event_seen_index.npy'):
+    """Deduplicate one event batch against the ingest history and save it sorted"""
+    print(f"Reading event batch: {input_file}")
+    df = pd.read_excel(input_file)
+    print(f"Batch shape: {df.shape}")
+
+    seen_keys = load_seen_index(index_file)
+    print(f"Known events in index: {len(seen_keys):,}")
+
+    result_df, seen_keys = dedup_and_sort_events(df, seen_keys)
+
+    result_df.to_excel(output_file, index=False)
+    save_seen_index(index_file, seen_keys)
+    print(f"✅ Saved {len(result_df):,} events to {output_file}")
+    return result_df
@@ -0,0 +1,113 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+
+from .event_dedup import NAT_NS, to_epoch_ns
+
+
+# Event fields kept in the store next to the timestamps
+STORE_FIELDS = ['latitude', 'longitude', 'type', 'speed', 'heading', 'mileage']
+
+INDEX_FILE = 'index.json'
+
+
+def build_event_store(df, store_dir, asset_col='asset_id', time_col='occurred_at', fields=None):
+    """
+    Write events as one memory-mappable .npy column per field, sorted by asset
+    and time, plus a small index of each asset's row range
+    """
+    if fields is None:
+        fields = [col for col in STORE_FIELDS if col in df.columns]
+
+    os.makedirs(store_dir, exist_ok=True)
+
+    t_ns = to_epoch_ns(df[time_col])
+    # Events without a time or an asset can't be placed in an asset's row range
+    valid = (t_ns != NAT_NS) & df[asset_col].notna().to_numpy()
+    df = df.loc[valid]
+    t_ns = t_ns[valid]
+
+    assets = df[asset_col].astype(str).to_numpy()
+    order = np.lexsort((t_ns, assets))
+    assets = assets[order]
+
+    np.save(os.path.join(store_dir, 'timestamps.npy'), t_ns[order])
+
+    columns = {}
+    for col in fields:
+        values = df[col].to_numpy()[order]
+        if pd.api.types.is_numeric_dtype(df[col]):
+            np.save(os.path.join(store_dir, f'{col}.npy'), values.astype(float))
+            columns[col] = None
+        else:
+            # Text fields are stored as int32 codes into a category list
+            codes, categories = pd.factorize(pd.Series(values))
+            np.save(os.path.join(store_dir, f'{col}.npy'), codes.astype(np.int32))
+            columns[col] = [str(c) for c in categories]
+
+    # Row range of every asset in the sorted columns
+    starts = np.flatnonzero(np.r_[True, assets[1:] != assets[:-1]]) if len(assets) else np.empty(0, int)
+    ends = np.r_[starts[1:], len(assets)]
+    index = {
+        'assets': {assets[s]: [int(s), int(e)] for s, e in zip(starts, ends)},
+        'columns': columns,
+        'rows': int(len(assets)),
+    }
+    with open(os.path.join(store_dir, INDEX_FILE), 'w') as file:
+        json.dump(index, file)
+
+    print(f"✅ Stored {len(assets):,} events for {len(starts)} assets in {store_dir}")
+
+
+class EventStore:
+    """Read-only, memory-mapped view of a store written by build_event_store"""
+
+    def __init__(self, store_dir):
+        with open(os.path.join(store_dir, INDEX_FILE), 'r') as file:
+            index = json.load(file)
+
+        self.assets = index['assets']
+        self.categories = index['columns']
+        self.timestamps = np.load(os.path.join(store_dir, 'timestamps.npy'), mmap_mode='r')
+        self.columns = {
+            col: np.load(os.path.join(store_dir, f'{col}.npy'), mmap_mode='r')
+            for col in self.categories
+        }
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def _bounds(self, asset_id, t0, t1):
+        """Row range [lo, hi) of an asset's events with t0 <= occurred_at <= t1"""
+        if asset_id not in self.assets:
+            return 0, 0
+        start, end = self.assets[asset_id]
+        times = self.timestamps[start:end]
+        lo = start if t0 is None else start + np.searchsorted(times, pd.Timestamp(t0).value, 'left')
+        hi = end if t1 is None else start + np.searchsorted(times, pd.Timestamp(t1).value, 'right')
+        return lo, max(lo, hi)
+
+    def query(self, asset_id, t0=None, t1=None):
+        """
+        Return an asset's events between t0 and t1 (inclusive) as a dict of
+        array slices of the memory map - nothing is copied
+        """
+        lo, hi = self._bounds(str(asset_id), t0, t1)
+        result = {'occurred_at': self.timestamps[lo:hi].view('datetime64[ns]')}
+        for col, values in self.columns.items():
+            result[col] = values[lo:hi]
+        return result
+
+    def decode(self, col, codes):
+        """Map stored category codes of a text field back to their values"""
+        categories = np.array(self.categories[col] + [None], dtype=object)
+        return categories[np.asarray(codes)]
+
+    def query_frame(self, asset_id, t0=None, t1=None):
+        """Same as query, but as a DataFrame with text fields decoded"""
+        data = self.query(asset_id, t0, t1)
+        for col in data:
+            if self.categories.get(col) is not None:
+                data[col] = self.decode(col, data[col])
+        return pd.DataFrame(data)
@@ -0,0 +1,238 @@
+import os
+import sys
+import json
+import asyncio
+from collections import deque
+import numpy as np
+import pandas as pd
+
+from .gps_outlier_filter import haversine_m, MAX_SPEED_KMH
+from .asset_ids import first_asset_id
+from .event_dedup import NAT_NS, to_epoch_ns
+
+
+# Number of recent fixes kept per asset for interpolation
+HISTORY_SIZE = 8
+# Consecutive rejected fixes that agree with each other replace the track, so one
+# bad first fix can't make every later fix look like a jump
+REANCHOR_FIXES = 3
+
+PERF_FIELDS = ['fuel_consumption', 'average_speed', 'excessive_idling_rating']
+CW_FIELDS = ['tourNo', 'clientAddress', 'containerType']
+
+
+def to_ns(value):
+    """Timestamp (string or datetime) to naive UTC nanoseconds, None if invalid"""
+    try:
+        ts = pd.Timestamp(value)
+    except (ValueError, TypeError):
+        return None
+    if pd.isna(ts):
+        return None
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert(None)
+    return ts.value
+
+
+class IntervalLookup:
+    """Sorted [start, end] intervals of one asset with a cursor for in-order lookups"""
+
+    def __init__(self, starts, ends, records):
+        self.starts = starts
+        self.ends = ends
+        self.records = records
+
+    @classmethod
+    def from_frame(cls, df, start_col, end_col, fields):
+        starts = to_epoch_ns(df[start_col])
+        ends = to_epoch_ns(df[end_col])
+        valid = (starts != NAT_NS) & (ends != NAT_NS)
+        order = np.argsort(starts[valid], kind='stable')
+        records = df.loc[valid, [col for col in fields if col in df.columns]].iloc[order].to_dict('records')
+        return cls(starts[valid][order], ends[valid][order], records)
+
+    def find(self, t, hint=-1):
+        """Position of the interval containing t (or -1), trying the hint first"""
+        if 0 <= hint < len(self.starts) and self.starts[hint] <= t <= self.ends[hint]:
+            return hint
+        pos = np.searchsorted(self.starts, t, 'right') - 1
+        if pos >= 0 and t <= self.ends[pos]:
+            return int(pos)
+        return -1
+
+
+class AssetState:
+    """In-memory state of one asset: recent fixes plus the open CW segment and Perform bucket"""
+
+    __slots__ = ('fixes', 'rejected', 'segment_pos', 'bucket_pos')
+
+    def __init__(self, history=HISTORY_SIZE):
+        self.fixes = deque(maxlen=history)
+        self.rejected = []
+        self.segment_pos = -1
+        self.bucket_pos = -1
+
+
+class StreamEnricher:
+    """
+    Enriches events one at a time with an interpolated position, the CW
+    segment and the Perform bucket they fall into
+    """
+
+    def __init__(self, cw_df=None, perform_df=None, history=HISTORY_SIZE, max_speed_kmh=MAX_SPEED_KMH,
+                 reanchor=REANCHOR_FIXES):
+        self.history = history
+        self.reanchor = reanchor
+        self.max_speed = max_speed_kmh / 3.6
+        self.states = {}
+        self.segments = {}
+        self.buckets = {}
+
+        asset_names = {}
+        if perform_df is not None:
+            perform_df = perform_df.copy()
+            perform_df['asset_id'] = first_asset_id(perform_df['asset_ids'])
+            asset_names = dict(zip(perform_df['asset_id'], perform_df['asset_name']))
+            for asset_id, group in perform_df.groupby('asset_id'):
+                self.buckets[asset_id] = IntervalLookup.from_frame(group, 'result_from', 'result_to', PERF_FIELDS)
+
+        if cw_df is not None:
+            trucks = {name: asset_id for asset_id, name in asset_names.items()}
+            for truck, group in cw_df.groupby('truck'):
+                if truck in trucks:
+                    self.segments[trucks[truck]] = IntervalLookup.from_frame(group, 'start', 'end', CW_FIELDS)
+
+    def _state(self, asset_id):
+        state = self.states.get(asset_id)
+        if state is None:
+            state = self.states[asset_id] = AssetState(self.history)
+        return state
+
+    def _plausible(self, fix, t, lat, lon):
+        t_prev, lat_prev, lon_prev = fix
+        return haversine_m(lat_prev, lon_prev, lat, lon) / max((t - t_prev) / 1e9, 1.0) <= self.max_speed
+
+    def _position(self, state, t, lat, lon):
+        """Accept a plausible fix, or estimate the position from the last fixes"""
+        fixes = state.fixes
+        if pd.notna(lat) and pd.notna(lon) and not (lat == 0 and lon == 0):
+            if fixes and not self._plausible(fixes[-1], t, lat, lon):
+                # Rejected fixes that agree with each other may mean the track itself was wrong
+                rejected = state.rejected
+                if rejected and not self._plausible(rejected[-1], t, lat, lon):
+                    rejected.clear()
+                rejected.append((t, lat, lon))
+                if len(rejected) < self.reanchor:
+                    return self._extrapolate(fixes, t), 'rejected'
+                fixes.clear()
+                fixes.extend(rejected)
+                rejected.clear()
+                return (lat, lon), 'reanchored'
+            state.rejected.clear()
+            fixes.append((t, lat, lon))
+            return (lat, lon), 'observed'
+
+        return self._extrapolate(fixes, t), 'interpolated'
+
+    @staticmethod
+    def _extrapolate(fixes, t):
+        """Linear estimate from the last two fixes, like interp1d's extrapolate"""
+        if not fixes:
+            return None, None
+        if len(fixes) == 1 or fixes[-1][0] == fixes[-2][0]:
+            return fixes[-1][1], fixes[-1][2]
+        (t0, lat0, lon0), (t1, lat1, lon1) = fixes[-2], fixes[-1]
+        ratio = (t - t0) / (t1 - t0)
+        return lat0 + (lat1 - lat0) * ratio, lon0 + (lon1 - lon0) * ratio
+
+    def enrich(self, event, lat_col='latitude', lon_col='longitude'):
+        """Return the event with position, CW segment and Perform bucket fields added"""
+        asset_id = event.get('asset_id')
+        t = to_ns(event.get('occurred_at'))
+        if asset_id is None or t is None:
+            return None
+
+        state = self._state(asset_id)
+        enriched = dict(event)
+
+        (lat, lon), source = self._position(state, t, event.get(lat_col), event.get(lon_col))
+        enriched[lat_col], enriched[lon_col] = lat, lon
+        enriched['position_source'] = source
+
+        segments = self.segments.get(asset_id)
+        if segments is not None:
+            state.segment_pos = segments.find(t, state.segment_pos)
+            if state.segment_pos >= 0:
+                enriched.update(segments.records[state.segment_pos])
+
+        buckets = self.buckets.get(asset_id)
+        if buckets is not None:
+            state.bucket_pos = buckets.find(t, state.bucket_pos)
+            if state.bucket_pos >= 0:
+                for col, value in buckets.records[state.bucket_pos].items():
+                    enriched[f'perf_{col}'] = value
+
+        return enriched
+
+
+def parse_event_line(line):
+    """Decode one JSON event line, or None (logged) if it is malformed"""
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError as e:
+        print(f"Skipping malformed event line {line[:80]!r}: {e}", file=sys.stderr)
+        return None
+
+
+async def tail_file(path, poll_interval=0.5, from_start=False):
+    """Yield JSON events appended to a file, one per line, like `tail -f`"""
+    with open(path, 'r') as file:
+        if not from_start:
+            file.seek(0, os.SEEK_END)
+        buffer = ''
+        while True:
+            chunk = file.readline()
+            if not chunk:
+                await asyncio.sleep(poll_interval)
+                continue
+            buffer += chunk
+            if buffer.endswith('\n'):
+                line, buffer = buffer.strip(), ''
+                event = parse_event_line(line) if line else None
+                if event is not None:
+                    yield event
+
+
+async def socket_events(host='127.0.0.1', port=8765, max_queue=10000):
+    """Yield JSON events sent line by line by any number of local socket clients"""
+    queue = asyncio.Queue(maxsize=max_queue)
+
+    async def handle(reader, writer):
+        while line := await reader.readline():
+            event = parse_event_line(line.decode(errors='replace')) if line.strip() else None
+            if event is not None:
+                await queue.put(event)
+        writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    print(f"Listening for events on {host}:{port}", file=sys.stderr)
+    async with server:
+        while True:
+            yield await queue.get()
+
+
+async def run_stream(source, enricher, sink=None):
+    """Enrich every event from the source and hand it to the sink as soon as it arrives"""
+    if sink is None:
+        def sink(record):
+            sys.stdout.write(json.dumps(record, default=str) + '\n')
+            sys.stdout.flush()
+
+    async for event in source:
+        try:
+            enriched = enricher.enrich(event)
+        except Exception as e:
+            print(f"Skipping event {event}: {e}", file=sys.stderr)
+            continue
+        if enriched is not None:
+            sink(enriched)
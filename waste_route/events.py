@@ -0,0 +1,25 @@
+import json
+import pandas as pd
+
+
+def read_event_json(file_path):
+    """Load the event export JSON (a list of records) as a DataFrame, None if it isn't tabular"""
+    with open(file_path, 'r') as file:
+        json_data = json.load(file)
+
+    # Ensure the JSON data is a list of records
+    if isinstance(json_data, list):
+        return pd.DataFrame(json_data)
+    return None
+
+
+def convert_event_json(input_file, output_file):
+    """Convert the event export JSON to an Excel file"""
+    df = read_event_json(input_file)
+    if df is None:
+        print("❌ The JSON data is not in a tabular format suitable for a DataFrame.")
+        return None
+
+    df.to_excel(output_file, index=False)
+    print(f"✅ JSON data successfully saved to {output_file}")
+    return df
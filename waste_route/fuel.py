@@ -0,0 +1,100 @@
+import pandas as pd
+
+
+def compute_fuel_for_cw(cw_file='CW.xlsx', perform_file='Perform.xlsx', output_file='CW_Updated.xlsx'):
+    # Read data
+    df_cw = pd.read_excel(cw_file)
+    df_perform = pd.read_excel(perform_file)
+
+    df_cw = merge_fuel_into_cw(df_cw, df_perform)
+
+    # Write to Excel
+    df_cw.to_excel(output_file, index=False)
+
+
+def merge_fuel_into_cw(df_cw, df_perform):
+    """Add total_fuel_for_CW to every CW row from the overlapping Perform intervals"""
+    df_cw = df_cw.copy()
+    df_perform = df_perform.copy()
+
+    # Convert to datetime
+    df_cw['start'] = pd.to_datetime(df_cw['start'])
+    df_cw['end'] = pd.to_datetime(df_cw['end'])
+    df_perform['result_from'] = pd.to_datetime(df_perform['result_from'])
+    df_perform['result_to'] = pd.to_datetime(df_perform['result_to'])
+
+    # Add a row ID to df_cw to help identify each row later
+    df_cw['cw_row_id'] = df_cw.index
+
+    # We'll create a cross-join only for matching truck vs asset_name:
+    # 1) rename or create a key in df_cw
+    df_cw['_truck_key'] = df_cw['truck']
+    df_perform['_truck_key'] = df_perform['asset_name']
+
+    # 2) add a dummy column for cross-join
+    df_cw['_dummy'] = 1
+    df_perform['_dummy'] = 1
+
+    # 3) merge on both _truck_key and _dummy
+    #    so we only get pairs of rows that have the same truck, but cross-join
+    merged = pd.merge(
+        df_cw, df_perform,
+        on=['_truck_key', '_dummy'],
+        how='left',
+        suffixes=('_cw', '_perf')
+    )
+    # save the merged file to a new excel name_ "MERGED" and check if the data is merged properly
+    # merged.to_excel('MERGED.xlsx', index=False)
+
+    # Define overlap function
+    def get_overlap_minutes(row):
+        start_cw = row['start']
+        end_cw = row['end']
+        start_pf = row['result_from']
+        end_pf = row['result_to']
+
+        # If any are null, no overlap
+        if pd.isnull(start_pf) or pd.isnull(end_pf):
+            return 0
+
+        # if (end_pf - start_pf) > (end_cw - start_cw):
+        #     print(f"Perform interval longer than CW interval: {row}")
+
+        overlap_start = max(start_cw, start_pf)
+        overlap_end = min(end_cw, end_pf)
+        overlap = (overlap_end - overlap_start).total_seconds() / 60.0
+        # if overlap > 0:
+        #     ic(row)
+        #     ic(overlap)
+        return overlap if overlap > 0 else 0
+
+    merged['overlap_minutes'] = merged.apply(get_overlap_minutes, axis=1)
+
+    # Perform interval length
+    merged['perform_interval_minutes'] = (
+            (merged['result_to'] - merged['result_from'])
+            .dt.total_seconds() / 60.0
+    )
+
+    # Overlap fraction
+    merged['overlap_fraction'] = merged.apply(
+        lambda r: (r['overlap_minutes'] / r['perform_interval_minutes'])
+        if r['perform_interval_minutes'] and r['perform_interval_minutes'] > 0
+        else 0,
+        axis=1
+    )
+
+    # Partial fuel
+    merged['partial_fuel'] = merged['overlap_fraction'] * merged['fuel_consumption'].fillna(0)
+
+    # Sum partial fuel by cw_row_id
+    fuel_sums = merged.groupby('cw_row_id')['partial_fuel'].sum().reset_index()
+    fuel_sums.rename(columns={'partial_fuel': 'total_fuel_for_CW'}, inplace=True)
+
+    # Merge back to df_cw
+    df_cw = pd.merge(df_cw, fuel_sums, on='cw_row_id', how='left')
+
+    # Clean up helper columns
+    df_cw.drop(columns=['_truck_key', '_dummy', 'cw_row_id'], inplace=True)
+
+    return df_cw
@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+
+from .asset_ids import first_asset_id
+from .event_dedup import NAT_NS, to_epoch_ns
+
+
+class FuelCurve:
+    """
+    Cumulative fuel of every asset over time, built from the 15-minute Perform
+    buckets. Fuel is assumed to be burnt evenly within a bucket and not at all
+    between buckets, so the curve is piecewise linear and the fuel between two
+    timestamps is the difference of two interpolations on it.
+
+    All assets share one time axis: asset k's knots are shifted by k times the
+    covered span, so one np.interp call evaluates any mix of assets.
+    """
+
+    def __init__(self, assets, knot_s, knot_fuel, first_s, last_s, origin_s, span_s):
+        self.assets = pd.Index(assets)
+        self.knot_s = knot_s
+        self.knot_fuel = knot_fuel
+        self.first_s = first_s
+        self.last_s = last_s
+        self.origin_s = origin_s
+        self.span_s = span_s
+
+    @classmethod
+    def from_perform(cls, perform_df, fuel_col='fuel_consumption', asset_col='asset_ids'):
+        """Build the curve from Perform rows with result_from, result_to and fuel"""
+        start = to_epoch_ns(perform_df['result_from'])
+        end = to_epoch_ns(perform_df['result_to'])
+        fuel = pd.to_numeric(perform_df[fuel_col], errors='coerce').fillna(0).to_numpy(dtype=float)
+        assets = first_asset_id(perform_df[asset_col])
+
+        keep = (start != NAT_NS) & (end != NAT_NS) & (end > start) & assets.notna().to_numpy()
+        codes, unique_assets = pd.factorize(assets[keep])
+        start, end, fuel = start[keep] // 10**9, end[keep] // 10**9, fuel[keep]
+
+        order = np.lexsort((start, codes))
+        codes, start, end, fuel = codes[order], start[order], end[order], fuel[order]
+
+        # Overlapping buckets of one asset are cut to start where the previous one ended
+        new_asset = np.r_[True, codes[1:] != codes[:-1]]
+        prev_end = pd.Series(end).groupby(codes).cummax().shift(1).to_numpy()
+        start = np.where(new_asset, start, np.maximum(start, np.nan_to_num(prev_end, nan=-np.inf))).astype(np.int64)
+        fuel = np.where(end > start, fuel, 0.0)
+        end = np.maximum(end, start)
+
+        origin_s = int(start.min()) if len(start) else 0
+        span_s = int(end.max()) - origin_s + 1 if len(end) else 1
+        offset = codes.astype(np.float64) * span_s - origin_s
+
+        # Two knots per bucket: (from, fuel so far) and (to, fuel so far + bucket fuel).
+        # The running total is global, differences within one asset are unaffected.
+        cumulative = np.cumsum(fuel)
+        knot_s = np.column_stack([start + offset, end + offset]).ravel()
+        knot_fuel = np.column_stack([cumulative - fuel, cumulative]).ravel()
+
+        # Codes are sorted and all present, so the i-th asset block belongs to asset i
+        block_start = np.flatnonzero(new_asset)
+        block_end = np.r_[block_start[1:], len(codes)] - 1
+        first_s = (start + offset)[block_start]
+        last_s = (end + offset)[block_end]
+
+        print(f"Built fuel curves for {len(unique_assets)} assets from {len(fuel):,} Perform buckets")
+        return cls(unique_assets, knot_s, knot_fuel, first_s, last_s, origin_s, span_s)
+
+    def _positions(self, asset_ids, times):
+        """Position of each (asset, time) on the shared axis, clipped to the asset's buckets"""
+        codes = self.assets.get_indexer(pd.Index(np.asarray(asset_ids, dtype=object)))
+        t = to_epoch_ns(pd.Series(np.asarray(times)))
+        known = (codes >= 0) & (t != NAT_NS)
+
+        safe = np.maximum(codes, 0)
+        position = safe.astype(np.float64) * self.span_s + (t / 1e9 - self.origin_s)
+        # Outside an asset's first and last bucket the curve is flat
+        position = np.clip(position, self.first_s[safe], self.last_s[safe]) if len(self.assets) else position
+        return position, known
+
+    def cumulative(self, asset_ids, times):
+        """Fuel burnt by each asset up to each time, relative to an arbitrary zero"""
+        position, known = self._positions(asset_ids, times)
+        fuel = np.interp(position, self.knot_s, self.knot_fuel) if len(self.knot_s) else np.zeros(len(position))
+        return np.where(known, fuel, np.nan)
+
+    def fuel_between(self, asset_ids, t0, t1):
+        """Fuel burnt by each asset between t0 and t1 (NaN for unknown assets or times)"""
+        return self.cumulative(asset_ids, t1) - self.cumulative(asset_ids, t0)
+
+    def save(self, path):
+        """Save the curve to one .npz file"""
+        np.savez(path, assets=np.asarray(self.assets, dtype=str), knot_s=self.knot_s, knot_fuel=self.knot_fuel,
+                 first_s=self.first_s, last_s=self.last_s, origin_s=self.origin_s, span_s=self.span_s)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        return cls(data['assets'], data['knot_s'], data['knot_fuel'], data['first_s'], data['last_s'],
+                   int(data['origin_s']), int(data['span_s']))
+
+
+def attribute_event_fuel(events_df, curve, asset_col='asset_id', time_col='occurred_at'):
+    """
+    Fuel of every interval between consecutive events of an asset, stored on
+    the interval's first event as 'interval_seconds' and 'interval_fuel'
+    """
+    t = to_epoch_ns(events_df[time_col])
+    codes, unique_assets = pd.factorize(events_df[asset_col])
+    # Events without an asset sort last and get no interval (0 fuel)
+    order = np.lexsort((t, np.where(codes < 0, len(codes), codes)))
+    t, codes = t[order], codes[order]
+    assets = np.asarray(unique_assets, dtype=object)[np.maximum(codes, 0)] if len(unique_assets) else codes
+
+    # Each event's interval ends at the next event of the same asset
+    same = (np.r_[codes[1:] == codes[:-1], False] & (codes >= 0) &
+            (t != NAT_NS) & (np.roll(t, -1) != NAT_NS))
+    next_t = np.where(same, np.roll(t, -1), t)
+
+    t0 = t.astype('datetime64[ns]')
+    t1 = next_t.astype('datetime64[ns]')
+    seconds = np.where(same, (next_t - t) / 1e9, 0.0)
+    fuel = np.where(same, curve.fuel_between(assets, t0, t1), 0.0)
+
+    result = events_df.iloc[order].copy()
+    result['interval_seconds'] = seconds
+    result['interval_fuel'] = np.nan_to_num(fuel)
+    return result
+
+
+def attribute_event_fuel_file(event_file, perform_file, output_file, curve_file=None):
+    """Attribute Perform fuel to the intervals between the events in a file"""
+    curve = FuelCurve.from_perform(pd.read_excel(perform_file))
+    if curve_file:
+        curve.save(curve_file)
+
+    result = attribute_event_fuel(pd.read_excel(event_file), curve)
+    result.to_excel(output_file, index=False)
+    print(f"✅ Attributed {result['interval_fuel'].sum():,.1f} fuel to {len(result):,} events, saved to {output_file}")
+    return result
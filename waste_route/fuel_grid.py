@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+
+from .event_dedup import NAT_NS, to_epoch_ns
+from .idling import IDLING, MAX_REPORT_GAP_S, classify_intervals
+
+
+# Finest cell edge in degrees (~110 m north-south); every level doubles the edge
+BASE_CELL_DEG = 0.001
+LEVELS = 6
+
+AGGREGATES = ['fuel', 'idle_seconds', 'seconds', 'points']
+
+
+def apportion_event_fuel(df, fuel_col='perf_fuel_consumption', asset_col='event_asset_id',
+                         time_col='event_occurred_at', lat_col='event_latitude', lon_col='event_longitude',
+                         segment_cols=('event_asset_id', 'start'), curve=None):
+    """
+    Turn fused events into intervals: each event gets the time until the next
+    event of its asset, whether it was idling, and its share of the segment's
+    fuel in proportion to that time. With a FuelCurve (see fuel_attribution)
+    the fuel is instead read off the Perform curve for the interval itself.
+    """
+    t = to_epoch_ns(df[time_col])
+    keep = ((t != NAT_NS) & df[asset_col].notna().to_numpy() &
+            df[lat_col].notna().to_numpy() & df[lon_col].notna().to_numpy())
+    df = df.loc[keep]
+    t = t[keep]
+
+    assets = df[asset_col].astype(str).to_numpy()
+    order = np.lexsort((t, assets))
+    df = df.iloc[order]
+    t, assets = t[order], assets[order]
+    lat = df[lat_col].to_numpy(dtype=float)
+    lon = df[lon_col].to_numpy(dtype=float)
+
+    # Same stationary test as the idling episodes; longer gaps are engine off and carry no time
+    state, seconds = classify_intervals(assets, t, lat, lon)
+    seconds = np.where(seconds <= MAX_REPORT_GAP_S, seconds, 0.0)
+    idle = state == IDLING
+
+    intervals = pd.DataFrame({
+        'latitude': lat,
+        'longitude': lon,
+        'seconds': seconds,
+        'idle_seconds': np.where(idle, seconds, 0.0),
+    })
+
+    if curve is not None:
+        t0 = t.astype('datetime64[ns]')
+        t1 = (t + (seconds * 1e9).astype(np.int64)).astype('datetime64[ns]')
+        intervals['fuel'] = np.nan_to_num(np.where(seconds > 0, curve.fuel_between(assets, t0, t1), 0.0))
+        return intervals
+
+    # Spread each segment's fuel over its events by interval length
+    segment = [df[col].to_numpy() for col in segment_cols]
+    segment_seconds = intervals.groupby(segment)['seconds'].transform('sum').to_numpy()
+    segment_fuel = pd.to_numeric(df[fuel_col], errors='coerce').fillna(0).to_numpy()
+    intervals['fuel'] = np.where(segment_seconds > 0, segment_fuel * seconds / np.maximum(segment_seconds, 1e-9), 0.0)
+
+    return intervals
+
+
+def cell_index(lat, lon, cell_deg=BASE_CELL_DEG):
+    """Integer row/column of the finest grid cell containing each point"""
+    iy = np.floor((np.asarray(lat) + 90.0) / cell_deg).astype(np.int64)
+    ix = np.floor((np.asarray(lon) + 180.0) / cell_deg).astype(np.int64)
+    return iy, ix
+
+
+class FuelGrid:
+    """
+    Fuel, idle time and dwell time per grid cell on several levels at once.
+    Level 0 is the finest; a level-k cell covers 2^k x 2^k finest cells.
+    """
+
+    def __init__(self, cell_deg=BASE_CELL_DEG, levels=LEVELS):
+        self.cell_deg = cell_deg
+        self.levels = levels
+        self.cells = {level: pd.DataFrame(columns=AGGREGATES, dtype=float) for level in range(levels)}
+
+    def update(self, intervals):
+        """Add a batch of intervals (see apportion_event_fuel) to every level"""
+        iy, ix = cell_index(intervals['latitude'], intervals['longitude'], self.cell_deg)
+        weights = {
+            'fuel': intervals['fuel'].to_numpy(dtype=float),
+            'idle_seconds': intervals['idle_seconds'].to_numpy(dtype=float),
+            'seconds': intervals['seconds'].to_numpy(dtype=float),
+            'points': None,
+        }
+
+        for level in range(self.levels):
+            # Coarser cells are the finest indices shifted right by the level
+            keys = (iy >> level) << 32 | (ix >> level)
+            unique_keys, inverse = np.unique(keys, return_inverse=True)
+
+            batch = pd.DataFrame({
+                col: np.bincount(inverse, weights=w, minlength=len(unique_keys)).astype(float)
+                for col, w in weights.items()
+            }, index=unique_keys)
+
+            self.cells[level] = self.cells[level].add(batch, fill_value=0)
+
+    def frame(self, level=0):
+        """Aggregates of one level with the centre coordinates of each cell"""
+        cells = self.cells[level].copy()
+        keys = cells.index.to_numpy(dtype=np.int64)
+        size = self.cell_deg * 2 ** level
+        cells.insert(0, 'latitude', (keys >> 32) * size - 90.0 + size / 2)
+        cells.insert(1, 'longitude', (keys & 0xFFFFFFFF) * size - 180.0 + size / 2)
+        cells['fuel_per_hour'] = np.where(cells['seconds'] > 0, cells['fuel'] / cells['seconds'] * 3600, np.nan)
+        cells.index.name = 'cell'
+        return cells.reset_index()
+
+    def hot_spots(self, level=0, by='fuel', top=20):
+        """Cells with the highest fuel (or idle_seconds) on a level"""
+        return self.frame(level).nlargest(top, by)
+
+    def save(self, path):
+        """Save all levels to one .npz file"""
+        arrays = {'cell_deg': np.array(self.cell_deg), 'levels': np.array(self.levels)}
+        for level, cells in self.cells.items():
+            arrays[f'keys_{level}'] = cells.index.to_numpy(dtype=np.int64)
+            arrays[f'values_{level}'] = cells[AGGREGATES].to_numpy(dtype=float)
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """Load a grid saved with save, ready for further updates"""
+        data = np.load(path)
+        grid = cls(float(data['cell_deg']), int(data['levels']))
+        for level in range(grid.levels):
+            grid.cells[level] = pd.DataFrame(data[f'values_{level}'], index=data[f'keys_{level}'],
+                                             columns=AGGREGATES)
+        return grid
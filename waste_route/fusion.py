@@ -0,0 +1,213 @@
+from collections import defaultdict
+import numpy as np
+import pandas as pd
+
+from .asset_ids import first_asset_id
+
+
+WEIGHTED_AVG_COLS = [
+    'total_rating', 'coasting_rating', 'acceleration_pedal_rating', 'braking_pedal_rating',
+    'cruise_control_rating', 'overspeed_rating', 'harsh_acceleration_rating', 'harsh_braking_rating',
+    'average_speed', 'average_rpm', 'fuel_efficiency', 'operating_conditions_score',
+    'overspeed_percentage', 'kickdown_percentage', 'excessive_idling_rating',
+    'ambient_temperature_min', 'ambient_temperature_max'
+]
+
+
+def load_fusion_inputs(cw_file, perform_file, event_file):
+    """Load the CW, Perform and interpolated Event data with naive datetime columns"""
+    print("Loading CW data...")
+    cw_df = pd.read_excel(cw_file)
+
+    print("Loading Perform data...")
+    perform_df = pd.read_excel(perform_file)
+
+    print("Loading Event data...")
+    event_df = pd.read_excel(event_file)
+
+    # Handle datetime columns
+    cw_df['start'] = pd.to_datetime(cw_df['start'], errors='coerce').dt.tz_localize(None)
+    cw_df['end'] = pd.to_datetime(cw_df['end'], errors='coerce').dt.tz_localize(None)
+    perform_df['result_from'] = pd.to_datetime(perform_df['result_from'], errors='coerce').dt.tz_localize(None)
+    perform_df['result_to'] = pd.to_datetime(perform_df['result_to'], errors='coerce').dt.tz_localize(None)
+    event_df['occurred_at'] = pd.to_datetime(event_df['occurred_at'], format="ISO8601").dt.tz_localize(None)
+
+    return cw_df, perform_df, event_df
+
+
+def align_assets(cw_df, perform_df, event_df):
+    """
+    Map CW trucks to Perform asset IDs and keep only the Perform and Event
+    rows of those assets
+    """
+    cw_df = cw_df.copy()
+    perform_df = perform_df.copy()
+
+    # Convert string representation of list to its single item
+    perform_df['asset_ids'] = first_asset_id(perform_df['asset_ids'])
+
+    # Map cw_df['truck'] to perf_asset_ids through asset_name -> asset_ids
+    mapping_dict = dict(zip(perform_df['asset_name'], perform_df['asset_ids']))
+    cw_df['perf_asset_ids'] = cw_df['truck'].map(mapping_dict)
+
+    valid_asset_ids = cw_df['perf_asset_ids'].dropna().unique()
+
+    perform_df_filtered = perform_df[perform_df['asset_ids'].isin(valid_asset_ids)].copy()
+    event_df = event_df[event_df['asset_id'].isin(valid_asset_ids)].copy()
+
+    return cw_df, perform_df, perform_df_filtered, event_df
+
+
+def classify_perform_columns(perform_df, weighted_avg_cols=WEIGHTED_AVG_COLS):
+    """Split the remaining Perform columns into linearly scaled (numeric) and categorical ones"""
+    excluded_cols = set(weighted_avg_cols + ['result_from', 'result_to', 'asset_name', 'asset_ids'])
+
+    linear_scale_cols = []
+    categorical_cols = []
+
+    for col in perform_df.columns:
+        if col in excluded_cols:
+            continue  # skip weighted avg and excluded cols
+
+        # Skip columns that are empty or all NaN
+        if perform_df[col].dropna().empty:
+            continue
+
+        if pd.api.types.is_numeric_dtype(perform_df[col]):
+            linear_scale_cols.append(col)
+        else:
+            categorical_cols.append(col)
+
+    return linear_scale_cols, categorical_cols
+
+
+# Define Overlap Time Calculation Function
+def calculate_overlap(start1, end1, start2, end2):
+    overlap_start = max(start1, start2)
+    overlap_end = min(end1, end2)
+    delta = overlap_end - overlap_start
+    return delta if delta > pd.Timedelta(0) else pd.Timedelta(0)
+
+
+def merge_tour_performance_data(cw_df, perf_df, linear_scale_cols, categorical_cols,
+                                weighted_avg_cols=WEIGHTED_AVG_COLS):
+    """
+    Merge Perform data into every CW segment: numeric columns scaled by the
+    overlap ratio, ratings averaged weighted by overlap time, categories joined
+    """
+    # intervaltree is only needed for this merge
+    from intervaltree import IntervalTree
+
+    print("Building IntervalTree from Performance data...")
+    perf_tree = IntervalTree()
+    for idx, row in perf_df.iterrows():
+        perf_tree[row['result_from'].timestamp():row['result_to'].timestamp()] = idx
+
+    print("Merging Performance data with CW data...")
+    merged_rows = []
+
+    for _, segment in cw_df.iterrows():
+        merged_row = segment.to_dict()
+
+        linear_sums = {col: 0.0 for col in linear_scale_cols}
+        weighted = {col: {'sum': 0.0, 'duration': 0.0} for col in weighted_avg_cols}
+        categorical_values = defaultdict(set)
+
+        seg_start_ts = segment['start'].timestamp()
+        seg_end_ts = segment['end'].timestamp()
+
+        overlapping_perf_intervals = perf_tree.overlap(seg_start_ts, seg_end_ts)
+
+        for interval in overlapping_perf_intervals:
+            perf_idx = interval.data
+            perf = perf_df.loc[perf_idx]
+
+            if perf['asset_name'] != segment['truck']:
+                continue
+
+            overlap_dur = calculate_overlap(segment['start'], segment['end'], perf['result_from'], perf['result_to'])
+            if overlap_dur.total_seconds() <= 0:
+                continue
+
+            perf_dur = perf['result_to'] - perf['result_from']
+            overlap_ratio = overlap_dur.total_seconds() / perf_dur.total_seconds()
+
+            for col in linear_scale_cols:
+                if pd.notna(perf[col]):
+                    linear_sums[col] += perf[col] * overlap_ratio
+
+            for col in weighted_avg_cols:
+                if col in perf and pd.notna(perf[col]):
+                    weighted[col]['sum'] += perf[col] * overlap_dur.total_seconds()
+                    weighted[col]['duration'] += overlap_dur.total_seconds()
+
+            for col in categorical_cols:
+                if pd.notna(perf[col]):
+                    categorical_values[col].add(str(perf[col]))
+
+        for col in linear_scale_cols:
+            merged_row[f'perf_{col}'] = linear_sums[col] if linear_sums[col] != 0 else None
+
+        for col in weighted_avg_cols:
+            dur = weighted[col]['duration']
+            merged_row[f'perf_{col}'] = weighted[col]['sum'] / dur if dur > 0 else None
+
+        for col in categorical_cols:
+            values = sorted(categorical_values[col])
+            merged_row[f'perf_{col}'] = ', '.join(values) if values else None
+
+        merged_rows.append(merged_row)
+
+    return pd.DataFrame(merged_rows)
+
+
+def merge_event_data(cw_perform_df, event_df):
+    """
+    Repeat every CW-Perform row once per event of its asset between its
+    'start' and 'end', with the event columns prefixed by 'event_'
+    """
+    print("Merging Event data with CW-Perform data...")
+
+    event_df = event_df.add_prefix('event_')
+    cw_perform_df = cw_perform_df.sort_values('start').reset_index(drop=True)
+    event_df = event_df.sort_values(['event_asset_id', 'event_occurred_at']).reset_index(drop=True)
+
+    # Row range of every asset in the sorted events, then a binary search per segment
+    asset_ranges = event_df.groupby('event_asset_id').indices
+    times = event_df['event_occurred_at'].to_numpy()
+
+    merged_parts = []
+    for _, row in cw_perform_df.iterrows():
+        rows = asset_ranges.get(row['perf_asset_ids'])
+        if rows is None:
+            continue
+        lo = rows[0] + np.searchsorted(times[rows], np.datetime64(row['start']), 'left')
+        hi = rows[0] + np.searchsorted(times[rows], np.datetime64(row['end']), 'right')
+        if hi <= lo:
+            continue
+
+        matching_events = event_df.iloc[lo:hi]
+        repeated_cw = pd.concat([row.to_frame().T] * len(matching_events), ignore_index=True)
+        merged_parts.append(pd.concat([repeated_cw, matching_events.reset_index(drop=True)], axis=1))
+
+    if not merged_parts:
+        return pd.DataFrame(columns=list(cw_perform_df.columns) + list(event_df.columns))
+    return pd.concat(merged_parts, ignore_index=True)
+
+
+def fuse_tour_data(cw_file, perform_file, event_file, output_file):
+    """Run the full CW + Perform + Event fusion and save the result"""
+    cw_df, perform_df, event_df = load_fusion_inputs(cw_file, perform_file, event_file)
+
+    print("Filtering Necessary Rows from Perform and Event Data...")
+    cw_df, perform_df, _, event_df = align_assets(cw_df, perform_df, event_df)
+
+    print("\nGrouping Perform columns for overlap calculation...")
+    linear_scale_cols, categorical_cols = classify_perform_columns(perform_df)
+
+    cw_perform_df = merge_tour_performance_data(cw_df, perform_df, linear_scale_cols, categorical_cols)
+    cw_perform_event_df = merge_event_data(cw_perform_df, event_df)
+
+    print("Saving final output...")
+    cw_perform_event_df.to_excel(output_file, index=False)
+    return cw_perform_event_df
@@ -0,0 +1,78 @@
+import os
+import pandas as pd
+
+from .address_index import (build_address_index, combine_address_index, fill_coordinates_from_index,
+                            load_address_index, missing_coordinates)
+from .cw_extract import CW_EXPORT_COLUMNS, extract_flc_arc
+
+
+GEOAPIFY_URL = "https://api.geoapify.com/v1/geocode/search"
+API_KEY = os.environ.get('GEOAPIFY_API_KEY', '786433156f5042d68cd42f0408e57c3f')
+
+
+# Function to get coordinates from the Geoapify API
+def get_coordinates(address, api_key=API_KEY):
+    # requests is only needed for actual API calls
+    import requests
+    from requests.structures import CaseInsensitiveDict
+
+    headers = CaseInsensitiveDict()
+    headers["Accept"] = "application/json"
+    response = requests.get(GEOAPIFY_URL, params={'text': address, 'apiKey': api_key}, headers=headers)
+
+    if response.status_code == 200:
+        data = response.json()
+        if data['features']:
+            longitude = data['features'][0]['properties']['lon']
+            latitude = data['features'][0]['properties']['lat']
+            return longitude, latitude
+    return None, None
+
+
+# Function to update a row with coordinates
+def update_coordinates(row):
+    if pd.isna(row['completionLongitude']) or pd.isna(row['completionLatitude']) or \
+       row['completionLongitude'] == 0 or row['completionLatitude'] == 0:
+        longitude, latitude = get_coordinates(row['clientAddress'])
+        if longitude is not None and latitude is not None:
+            row['completionLongitude'] = longitude
+            row['completionLatitude'] = latitude
+    return row
+
+
+def geocode_missing(df, index_file=r"Output/address_index.xlsx"):
+    """
+    Fill missing or zero coordinates: first from the historical address index,
+    then from Geoapify, calling it once per remaining address
+    """
+    # Fill coordinates of already visited addresses from the historical completion index,
+    # so the geocoder below only sees truly new addresses
+    address_index = combine_address_index(load_address_index(index_file), build_address_index(df))
+    address_index.to_excel(index_file, index=False)
+    df = fill_coordinates_from_index(df, address_index)
+
+    missing = missing_coordinates(df)
+    addresses = df.loc[missing, 'clientAddress'].dropna().unique()
+    print(f"Geocoding {len(addresses):,} new addresses...")
+
+    for address in addresses:
+        longitude, latitude = get_coordinates(address)
+        if longitude is not None and latitude is not None:
+            rows = missing & (df['clientAddress'] == address)
+            df.loc[rows, 'completionLongitude'] = longitude
+            df.loc[rows, 'completionLatitude'] = latitude
+
+    return df
+
+
+def geocode_cw_file(input_file, output_file, index_file=r"Output/address_index.xlsx"):
+    """Extract the FLC/ARC rows of a CW export and fill in their missing coordinates"""
+    df = pd.read_excel(input_file)
+    extracted_df = extract_flc_arc(df, CW_EXPORT_COLUMNS)
+
+    latilong = geocode_missing(extracted_df, index_file)
+
+    # Save the updated DataFrame to a new file
+    latilong.to_excel(output_file, index=False)
+    print(f"✅ Coordinates saved to {output_file}")
+    return latilong
@@ -0,0 +1,170 @@
+import numpy as np
+import pandas as pd
+
+from .event_dedup import NAT_NS, to_epoch_ns
+
+
+EARTH_RADIUS_M = 6371008.8
+
+# Plausibility limits for a refuse truck
+MAX_SPEED_KMH = 150.0
+MAX_ACCEL_MS2 = 4.0
+MIN_DETOUR_M = 200.0
+# Longest run of consecutive bad fixes (e.g. multipath drift) that is looked for
+MAX_CLUSTER_FIXES = 10
+
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    """Vectorized great-circle distance in metres"""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2 +
+         np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def _shift(arr, n):
+    """Shift a float array by n positions, padding with NaN"""
+    out = np.full_like(arr, np.nan)
+    if n > 0:
+        out[n:] = arr[:-n]
+    elif n < 0:
+        out[:n] = arr[-n:]
+    else:
+        out[:] = arr
+    return out
+
+
+def _flag_clusters(g, ts, la, lo, jumps, max_speed, max_cluster):
+    """
+    Forward pass from the last good fix (anchor) before every too-fast segment:
+    the fixes after the anchor up to the first one it can plausibly reach are
+    a cluster of bad fixes. Only the jump segments are looped over; if no fix
+    within max_cluster is reachable, the jump is taken as real and kept.
+
+    A cluster at the very start of a track has no good fix before it, so jumps
+    the forward pass could not resolve are mirrored: a backward pass from the
+    fix after the jump (if it agrees with its own next fix) flags the fixes
+    back to the first one it can reach, or all of them if the track starts
+    within max_cluster fixes and fewer fixes lie before the jump than after it.
+    """
+    flagged = np.zeros(len(g), dtype=bool)
+    unresolved = []
+    for anchor in jumps:
+        if flagged[anchor]:
+            # The jump starts inside an already flagged cluster
+            continue
+        ahead = np.arange(anchor + 1, min(anchor + 1 + max_cluster, len(g)))
+        ahead = ahead[g[ahead] == g[anchor]]
+        speed = (haversine_m(la[anchor], lo[anchor], la[ahead], lo[ahead]) /
+                 np.maximum(ts[ahead] - ts[anchor], 1.0))
+        reachable = np.flatnonzero(speed <= max_speed)
+        if len(reachable) and reachable[0] > 0:
+            flagged[ahead[:reachable[0]]] = True
+        elif not len(reachable):
+            unresolved.append(anchor)
+
+    for jump in unresolved:
+        anchor = jump + 1
+        if flagged[anchor] or anchor + 1 >= len(g) or g[anchor + 1] != g[anchor]:
+            continue
+        if (haversine_m(la[anchor], lo[anchor], la[anchor + 1], lo[anchor + 1]) /
+                max(ts[anchor + 1] - ts[anchor], 1.0)) > max_speed:
+            # The fix after the jump is no better than the ones before it
+            continue
+        behind = np.arange(anchor - 1, max(anchor - 1 - max_cluster, -1), -1)
+        behind = behind[g[behind] == g[anchor]]
+        speed = (haversine_m(la[anchor], lo[anchor], la[behind], lo[behind]) /
+                 np.maximum(ts[anchor] - ts[behind], 1.0))
+        reachable = np.flatnonzero(speed <= max_speed)
+        if len(reachable):
+            flagged[behind[:reachable[0]]] = True
+            continue
+
+        # Which side of a jump at the track start is bad is only decided by
+        # numbers: the fixes before it must be fewer than the run after it
+        track_start = behind[-1] == 0 or g[behind[-1] - 1] != g[anchor]
+        later = jumps[jumps > anchor]
+        run_end = min(later[0] if len(later) else len(g), np.searchsorted(g, g[anchor], 'right') - 1)
+        if track_start and len(behind) < run_end - anchor + 1:
+            flagged[behind] = True
+    return flagged
+
+
+def flag_gps_outliers(df, lat_col, lon_col, time_col, group_col='asset_id',
+                      max_speed_kmh=MAX_SPEED_KMH, max_accel_ms2=MAX_ACCEL_MS2,
+                      min_detour_m=MIN_DETOUR_M, max_passes=3, max_cluster=MAX_CLUSTER_FIXES):
+    """
+    Return a boolean mask of implausible GPS fixes.
+
+    A fix is implausible if it is (0, 0) or out of range, if the implied speed
+    both into and out of it exceeds max_speed_kmh, or if the truck would have
+    to accelerate into it and brake out of it harder than max_accel_ms2 while
+    taking a detour of more than min_detour_m. Runs of up to max_cluster bad
+    fixes are caught by checking the speed from the last good fix instead
+    (or, at the start of a track, back from the first good fix).
+    """
+    lat = pd.to_numeric(df[lat_col], errors='coerce').to_numpy(dtype=float)
+    lon = pd.to_numeric(df[lon_col], errors='coerce').to_numpy(dtype=float)
+    t_ns = to_epoch_ns(df[time_col])
+    t = np.where(t_ns == NAT_NS, np.nan, t_ns / 1e9)
+
+    if group_col and group_col in df.columns:
+        groups = pd.factorize(df[group_col])[0]
+    else:
+        groups = np.zeros(len(df), dtype=int)
+
+    outlier = ((lat == 0) & (lon == 0)) | (np.abs(lat) > 90) | (np.abs(lon) > 180)
+    max_speed = max_speed_kmh / 3.6
+
+    for _ in range(max_passes):
+        valid = np.isfinite(lat) & np.isfinite(lon) & np.isfinite(t) & ~outlier
+        idx = np.flatnonzero(valid)
+        if len(idx) < 3:
+            break
+        idx = idx[np.lexsort((t[idx], groups[idx]))]
+
+        g, ts, la, lo = groups[idx], t[idx], lat[idx], lon[idx]
+
+        # Segment k joins fix k and fix k+1 of the same asset
+        same = np.append(g[1:] == g[:-1], False)
+        dt = np.where(same, np.maximum(_shift(ts, -1) - ts, 1.0), np.nan)
+        dist = np.where(same, haversine_m(la, lo, _shift(la, -1), _shift(lo, -1)), np.nan)
+        speed = dist / dt
+
+        v_in, v_out = _shift(speed, 1), speed
+        dt_in, dt_out = _shift(dt, 1), dt
+
+        # Too fast on both sides, or at a track end with a plausible neighbour
+        speed_spike = (v_in > max_speed) & (v_out > max_speed)
+        speed_spike |= np.isnan(v_in) & (v_out > max_speed) & (_shift(speed, -1) <= max_speed)
+        speed_spike |= np.isnan(v_out) & (v_in > max_speed) & (_shift(speed, 2) <= max_speed)
+
+        accel_up = (v_in - _shift(speed, 2)) / dt_in
+        accel_down = (_shift(speed, -1) - v_out) / dt_out
+        shortcut = haversine_m(_shift(la, 1), _shift(lo, 1), _shift(la, -1), _shift(lo, -1))
+        detour = _shift(dist, 1) + dist - np.where(_shift(same.astype(float), 1) == 1, shortcut, np.nan)
+        accel_spike = (accel_up > max_accel_ms2) & (accel_down < -max_accel_ms2) & (detour > min_detour_m)
+
+        jumps = np.flatnonzero(speed > max_speed)
+        cluster = _flag_clusters(g, ts, la, lo, jumps, max_speed, max_cluster)
+
+        new_outliers = idx[speed_spike | accel_spike | cluster]
+        if len(new_outliers) == 0:
+            break
+        outlier[new_outliers] = True
+
+    return outlier
+
+
+def filter_gps_outliers(df, lat_col, lon_col, time_col, group_col='asset_id', **limits):
+    """
+    Blank out implausible fixes so they get re-interpolated from their neighbours
+    """
+    df_work = df.copy()
+    outlier = flag_gps_outliers(df_work, lat_col, lon_col, time_col, group_col, **limits)
+
+    df_work['gps_outlier'] = outlier
+    df_work.loc[outlier, [lat_col, lon_col]] = np.nan
+
+    print(f"Removed {outlier.sum():,} implausible GPS fixes out of {len(df_work):,} rows")
+    return df_work
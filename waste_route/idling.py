@@ -0,0 +1,190 @@
+import numpy as np
+import pandas as pd
+
+from .event_dedup import NAT_NS, to_epoch_ns
+from .gps_outlier_filter import haversine_m
+
+
+# Slower than this between two fixes counts as standing still ...
+STATIONARY_SPEED_MS = 0.5
+# ... as long as the fixes are also no further apart than this, however long the gap
+MAX_STATIONARY_DISPLACEMENT_M = 50
+# Fixes further apart than this mean the unit stopped reporting (engine off)
+MAX_REPORT_GAP_S = 15 * 60
+# Shorter stationary runs are traffic, not stops
+MIN_EPISODE_S = 60
+
+MOVING, IDLING, PARKED = 0, 1, 2
+EPISODE_KINDS = {IDLING: 'idling', PARKED: 'parked'}
+
+CW_FIELDS = ['truck', 'tourNo', 'clientAddress', 'start', 'end']
+
+
+def classify_intervals(asset_codes, t_ns, lat, lon, stationary_speed_ms=STATIONARY_SPEED_MS,
+                       max_displacement_m=MAX_STATIONARY_DISPLACEMENT_M, max_report_gap_s=MAX_REPORT_GAP_S):
+    """
+    State of every interval between consecutive fixes (sorted by asset and time):
+    MOVING, IDLING (stationary while still reporting) or PARKED (stationary
+    across a reporting gap), with the interval length in seconds. The last fix
+    of each asset has no interval (state MOVING, length 0).
+    """
+    same = np.r_[asset_codes[1:] == asset_codes[:-1], False]
+    dt = np.where(same, (np.roll(t_ns, -1) - t_ns) / 1e9, 0.0)
+    dist = np.where(same, haversine_m(lat, lon, np.roll(lat, -1), np.roll(lon, -1)), np.inf)
+
+    # Speed alone would let a long gap hide kilometres of driving
+    limit = np.minimum(stationary_speed_ms * np.maximum(dt, 1.0), max_displacement_m)
+    stationary = same & (dist <= limit)
+    state = np.full(len(t_ns), MOVING, dtype=np.int8)
+    state[stationary & (dt <= max_report_gap_s)] = IDLING
+    state[stationary & (dt > max_report_gap_s)] = PARKED
+    return state, dt
+
+
+def run_length_encode(values, breaks):
+    """Start, end (inclusive) and value of runs of equal values, also split where breaks is True"""
+    change = np.r_[True, (values[1:] != values[:-1]) | breaks[1:]]
+    starts = np.flatnonzero(change)
+    ends = np.r_[starts[1:] - 1, len(values) - 1]
+    return starts, ends, values[starts]
+
+
+def detect_episodes(events_df, asset_col='asset_id', time_col='occurred_at', lat_col='latitude',
+                    lon_col='longitude', min_episode_s=MIN_EPISODE_S, **thresholds):
+    """
+    Find idling and parked episodes of every asset in one pass over the
+    sorted events, as compact (start, end, location, duration) records
+    """
+    t = to_epoch_ns(events_df[time_col])
+    lat = pd.to_numeric(events_df[lat_col], errors='coerce').to_numpy(dtype=float)
+    lon = pd.to_numeric(events_df[lon_col], errors='coerce').to_numpy(dtype=float)
+    keep = (t != NAT_NS) & np.isfinite(lat) & np.isfinite(lon) & events_df[asset_col].notna().to_numpy()
+
+    codes, assets = pd.factorize(events_df.loc[keep, asset_col])
+    t, lat, lon = t[keep], lat[keep], lon[keep]
+
+    order = np.lexsort((t, codes))
+    codes, t, lat, lon = codes[order], t[order], lat[order], lon[order]
+
+    state, _ = classify_intervals(codes, t, lat, lon, **thresholds)
+    if len(state) == 0:
+        return pd.DataFrame(columns=[asset_col, 'kind', 'start', 'end', 'duration_s',
+                                     'latitude', 'longitude', 'n_events'])
+
+    # Runs may not continue across assets
+    starts, ends, kinds = run_length_encode(state, np.r_[True, codes[1:] != codes[:-1]])
+    stationary = kinds != MOVING
+    starts, ends, kinds = starts[stationary], ends[stationary], kinds[stationary]
+
+    # Interval k joins fix k and k+1, so a run of intervals s..e covers fixes s..e+1
+    start_ns = t[starts]
+    end_ns = t[ends + 1]
+    duration_s = (end_ns - start_ns) / 1e9
+    n_fixes = ends - starts + 2
+
+    # Mean position of the run's fixes via cumulative sums
+    cum_lat = np.r_[0.0, np.cumsum(lat)]
+    cum_lon = np.r_[0.0, np.cumsum(lon)]
+    episode_lat = (cum_lat[ends + 2] - cum_lat[starts]) / n_fixes
+    episode_lon = (cum_lon[ends + 2] - cum_lon[starts]) / n_fixes
+
+    episodes = pd.DataFrame({
+        asset_col: np.asarray(assets)[codes[starts]],
+        'kind': pd.Series(kinds).map(EPISODE_KINDS).to_numpy(),
+        'start': pd.to_datetime(start_ns),
+        'end': pd.to_datetime(end_ns),
+        'duration_s': duration_s,
+        'latitude': episode_lat,
+        'longitude': episode_lon,
+        'n_events': n_fixes,
+    })
+    episodes = episodes[episodes['duration_s'] >= min_episode_s].reset_index(drop=True)
+
+    print(f"Found {len(episodes):,} stationary episodes "
+          f"({(episodes['kind'] == 'idling').sum():,} idling) for {len(assets)} assets")
+    return episodes
+
+
+def attach_cw_segments(episodes, cw_df, asset_col='asset_id', cw_asset_col='perf_asset_ids', fields=CW_FIELDS):
+    """
+    Attach to every episode the CW segment of the same asset that overlaps it
+    most, plus the overlap in seconds. Episodes overlapping no segment are
+    left without CW fields.
+    """
+    cw_start = to_epoch_ns(cw_df['start'])
+    cw_end = to_epoch_ns(cw_df['end'])
+    valid = (cw_start != NAT_NS) & (cw_end != NAT_NS) & cw_df[cw_asset_col].notna().to_numpy()
+    cw = cw_df[valid]
+    cw_start, cw_end = cw_start[valid], cw_end[valid]
+
+    codes, assets = pd.factorize(cw[cw_asset_col])
+    episode_codes = pd.Index(assets).get_indexer(episodes[asset_col])
+
+    ep_start = episodes['start'].values.astype('datetime64[ns]').astype('int64')
+    ep_end = episodes['end'].values.astype('datetime64[ns]').astype('int64')
+
+    # Sorted (asset, second) keys for all segments, so the candidates of every
+    # episode are found with searchsorted instead of a loop per truck
+    times = np.r_[cw_start, cw_end, ep_start, ep_end]
+    origin = times.min() // 10**9 if len(times) else 0
+    span = times.max() // 10**9 - origin + 1 if len(times) else 1
+
+    def key(asset_codes, t_ns):
+        return asset_codes.astype(np.int64) * span + (t_ns // 10**9 - origin)
+
+    order = np.lexsort((cw_start, codes))
+    codes, cw_start, cw_end = codes[order], cw_start[order], cw_end[order]
+    cw = cw.iloc[order]
+
+    # Segments start in order; the running maximum of their ends (per asset) is
+    # sorted too, so the candidates of an episode are one contiguous block:
+    # after every segment that ended before it, before every one starting after it
+    start_key = key(codes, cw_start)
+    end_key = pd.Series(key(codes, cw_end)).groupby(codes).cummax().to_numpy()
+    known = episode_codes >= 0
+    lo = np.searchsorted(end_key, key(episode_codes, ep_start), 'left')
+    hi = np.searchsorted(start_key, key(episode_codes, ep_end), 'right')
+    counts = np.where(known, np.maximum(hi - lo, 0), 0)
+
+    # One row per (episode, candidate segment); keep the largest overlap per episode
+    pair_episode = np.repeat(np.arange(len(episodes)), counts)
+    pair_segment = np.repeat(lo, counts) + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    overlap = (np.minimum(ep_end[pair_episode], cw_end[pair_segment]) -
+               np.maximum(ep_start[pair_episode], cw_start[pair_segment]))
+    best = np.lexsort((-overlap, pair_episode))
+    first = best[np.r_[True, pair_episode[best][1:] != pair_episode[best][:-1]]] if len(best) else best
+
+    pos = np.full(len(episodes), -1)
+    best_overlap = np.zeros(len(episodes))
+    overlapping = overlap[first] > 0
+    pos[pair_episode[first][overlapping]] = pair_segment[first][overlapping]
+    best_overlap[pair_episode[first][overlapping]] = overlap[first][overlapping] / 1e9
+    hit = pos >= 0
+
+    attached = episodes.copy()
+    for col in fields:
+        if col in cw.columns:
+            name = f'cw_{col}' if col in ('start', 'end') else col
+            attached[name] = pd.Series(cw[col].to_numpy()[np.maximum(pos, 0)] if len(cw) else None,
+                                       index=attached.index).where(hit)
+    attached['cw_overlap_s'] = best_overlap
+
+    print(f"Attached {int(hit.sum()):,} of {len(episodes):,} episodes to CW segments")
+    return attached
+
+
+def detect_idling_file(event_file, cw_file, perform_file, output_file):
+    """Detect idling and stop episodes in the interpolated events and attach them to CW segments"""
+    from .fusion import align_assets
+
+    events_df = pd.read_excel(event_file)
+    cw_df = pd.read_excel(cw_file)
+    perform_df = pd.read_excel(perform_file)
+
+    # CW rows only know the truck name; Perform maps it to the event asset ID
+    cw_df, _, _, _ = align_assets(cw_df, perform_df, events_df.iloc[:0])
+
+    episodes = attach_cw_segments(detect_episodes(events_df), cw_df)
+    episodes.to_excel(output_file, index=False)
+    print(f"✅ Stationary episodes saved to {output_file}")
+    return episodes
@@ -0,0 +1,28 @@
+import pandas as pd
+
+
+def normalize_perform_times(df):
+    """Turn the ISO 'result_from'/'result_to' strings into 'YYYY-MM-DD HH:MM:SS' and sort by asset"""
+    df = df.copy()
+
+    # Convert the time format for 'result_from' and 'result_to'
+    df['result_from'] = pd.to_datetime(df['result_from'], format='ISO8601').dt.strftime('%Y-%m-%d %H:%M:%S')
+    df['result_to'] = pd.to_datetime(df['result_to'], format='ISO8601').dt.strftime('%Y-%m-%d %H:%M:%S')
+
+    # Sort the DataFrame by 'asset_name'
+    # output:
+    #     asset_name          result_from            result_to  fuel_consumption
+    # 823  IN A 1120  2025-02-03 04:37:02  2025-02-03 04:45:00               1.0
+    # 831  IN A 1120  2025-02-03 04:45:00  2025-02-03 05:00:00               1.0
+    return df.sort_values(by=['asset_name', 'result_from'])
+
+
+def normalize_perform_file(input_file, output_file):
+    """Normalise the timestamps of a Perform export and save it as Excel"""
+    df = pd.read_excel(input_file)
+    print(df.columns.tolist())  # Print all column headers
+
+    df = normalize_perform_times(df)
+    df.to_excel(output_file, index=False)
+    print(f"✅ Perform data saved to {output_file}")
+    return df
@@ -0,0 +1,165 @@
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, unquote
+
+
+# Fused outputs served by the service, by table name
+TABLE_FILES = {
+    'fused': 'cw_perform_event.xlsx',
+    'cw': 'CW_Updated.xlsx',
+}
+
+CACHE_SIZE = 256
+
+# Parsed copies of the served workbooks; the workbooks themselves are never written
+TABLE_CACHE_DIR = r"Output/table_cache"
+
+
+def load_table(excel_file, cache_dir=TABLE_CACHE_DIR):
+    """
+    Load an Excel output once and keep a pickle of it in cache_dir (None to
+    disable), so restarts read the columnar copy instead of reparsing the workbook
+    """
+    cache_file = None
+    if cache_dir:
+        # Workbooks with the same name in different folders get different caches
+        path_hash = hashlib.md5(os.path.abspath(excel_file).encode()).hexdigest()[:8]
+        name = os.path.splitext(os.path.basename(excel_file))[0]
+        cache_file = os.path.join(cache_dir, f'{name}_{path_hash}.pkl')
+        if os.path.exists(cache_file) and os.path.getmtime(cache_file) >= os.path.getmtime(excel_file):
+            return pd.read_pickle(cache_file)
+
+    df = pd.read_excel(excel_file)
+    for col in ['start', 'end']:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+
+    if cache_file:
+        os.makedirs(cache_dir, exist_ok=True)
+        df.to_pickle(cache_file)
+    return df
+
+
+class TourTable:
+    """One fused table with lookup indices for tour, truck/day and time range"""
+
+    def __init__(self, df):
+        self.df = df.sort_values('start').reset_index(drop=True) if 'start' in df.columns else df
+        self.start = self.df['start'].values if 'start' in self.df.columns else None
+
+        self.by_tour = self.df.groupby(self.df['tourNo'].astype(str)).indices if 'tourNo' in self.df.columns else {}
+
+        if 'truck' in self.df.columns and self.start is not None:
+            day = self.df['start'].dt.strftime('%Y-%m-%d')
+            self.by_truck_day = self.df.groupby([self.df['truck'].astype(str), day]).indices
+        else:
+            self.by_truck_day = {}
+
+    def tour(self, tour_no):
+        return self.df.iloc[self.by_tour.get(tour_no, [])]
+
+    def truck_day(self, truck, day):
+        return self.df.iloc[self.by_truck_day.get((truck, day), [])]
+
+    def date_range(self, start, end, truck=None):
+        if self.start is None:
+            return self.df.iloc[[]]
+        lo = np.searchsorted(self.start, np.datetime64(pd.Timestamp(start)), 'left')
+        hi = np.searchsorted(self.start, np.datetime64(pd.Timestamp(end)), 'right')
+        result = self.df.iloc[lo:hi]
+        if truck is not None:
+            result = result[result['truck'].astype(str) == truck]
+        return result
+
+
+class TourQueryService:
+    """Answers tour, truck/day and date-range queries with an LRU result cache"""
+
+    def __init__(self, tables, cache_size=CACHE_SIZE):
+        self.tables = {name: TourTable(df) for name, df in tables.items()}
+        self.run_query = lru_cache(maxsize=cache_size)(self._run_query)
+
+    def _run_query(self, table_name, kind, args):
+        """Run one query and return the JSON response body"""
+        table = self.tables[table_name]
+        if kind == 'tour':
+            result = table.tour(*args)
+        elif kind == 'truck':
+            result = table.truck_day(*args)
+        elif kind == 'range':
+            result = table.date_range(*args)
+        else:
+            raise KeyError(kind)
+        return result.to_json(orient='records', date_format='iso').encode('utf-8')
+
+
+def make_handler(service):
+    """Build a request handler bound to one service instance"""
+
+    class TourQueryHandler(BaseHTTPRequestHandler):
+        # GET /tour/<tourNo>
+        # GET /truck/<truck>/<YYYY-MM-DD>
+        # GET /range?start=...&end=...[&truck=...]
+        # Every route takes an optional ?table=fused|cw
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            parts = [unquote(p) for p in url.path.strip('/').split('/') if p]
+            params = {k: v[0] for k, v in parse_qs(url.query).items()}
+            table_name = params.get('table', 'fused')
+
+            if parts == ['health']:
+                return self._send(200, json.dumps({'tables': list(service.tables)}).encode('utf-8'))
+            if table_name not in service.tables:
+                return self._send(404, b'{"error": "unknown table"}')
+
+            try:
+                if len(parts) == 2 and parts[0] == 'tour':
+                    body = service.run_query(table_name, 'tour', (parts[1],))
+                elif len(parts) == 3 and parts[0] == 'truck':
+                    body = service.run_query(table_name, 'truck', (parts[1], parts[2]))
+                elif parts == ['range'] and 'start' in params and 'end' in params:
+                    body = service.run_query(table_name, 'range',
+                                             (params['start'], params['end'], params.get('truck')))
+                else:
+                    return self._send(404, b'{"error": "unknown query"}')
+            except ValueError as e:
+                return self._send(400, json.dumps({'error': str(e)}).encode('utf-8'))
+
+            self._send(200, body)
+
+        def _send(self, status, body):
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return TourQueryHandler
+
+
+def serve(table_files=TABLE_FILES, host='127.0.0.1', port=8050):
+    """Load the fused tables and serve them until interrupted"""
+    tables = {}
+    for name, excel_file in table_files.items():
+        if os.path.exists(excel_file):
+            print(f"Loading {name} table from {excel_file}...")
+            tables[name] = load_table(excel_file)
+        else:
+            print(f"Warning: {excel_file} not found, skipping {name} table")
+
+    service = TourQueryService(tables)
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    print(f"✅ Serving {list(tables)} on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
@@ -0,0 +1,127 @@
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+from .gps_outlier_filter import haversine_m
+from .travel_time_matrix import DETOUR_FACTOR
+
+
+FUEL_COL = 'total_fuel_for_CW'
+
+# Speed assumed for legs of a tour without any known completion coordinates
+DEFAULT_KMH = 20.0
+
+# Trucks with less driving between completions than this get the fleet median fuel/km;
+# fuel burnt while standing at stops would otherwise be divided by almost no distance
+MIN_TRUCK_KM = 10.0
+
+
+def leg_km(lat, lon):
+    """Road-distance estimate in km between every pair of the given stops"""
+    lat, lon = np.asarray(lat, dtype=float), np.asarray(lon, dtype=float)
+    return haversine_m(lat[:, None], lon[:, None], lat[None, :], lon[None, :]) / 1000 * DETOUR_FACTOR
+
+
+def historical_fuel_per_km(cw_df, fuel_col=FUEL_COL, min_km=MIN_TRUCK_KM):
+    """
+    Fuel per km of every truck, from the fuel compute_fuel_for_cw assigned to
+    the CW rows and the distance between consecutive completions of each tour
+    """
+    df = cw_df.dropna(subset=['tourNo', 'completionLatitude', 'completionLongitude'])
+    df = df[(df['completionLatitude'] != 0) & (df['completionLongitude'] != 0)]
+    df = df.sort_values(['tourNo', 'start'])
+
+    prev = df.groupby('tourNo')[['completionLatitude', 'completionLongitude']].shift()
+    km = haversine_m(prev['completionLatitude'], prev['completionLongitude'],
+                     df['completionLatitude'], df['completionLongitude']) / 1000 * DETOUR_FACTOR
+
+    per_truck = pd.DataFrame({'truck': df['truck'], 'km': km, 'fuel': df[fuel_col]}).dropna()
+    totals = per_truck.groupby('truck')[['km', 'fuel']].sum()
+    fuel_per_km = totals['fuel'] / totals['km'].where(totals['km'] >= min_km)
+    return fuel_per_km.fillna(fuel_per_km.median())
+
+
+def tour_inputs(cw_df, tour_no, matrix, fuel_per_km):
+    """
+    Precompute everything needed to score orderings of one tour: the travel
+    minutes and km between its stops, the fuel rate of its truck and the
+    historical service minutes, which don't depend on the order
+    """
+    tour = cw_df[cw_df['tourNo'] == tour_no].sort_values('start')
+    stop_ids = matrix.client_ids(tour['clientAddress'])
+    start_hour = tour['start'].iloc[0].hour + tour['start'].iloc[0].minute / 60
+
+    minutes = matrix.submatrix(stop_ids, start_hour)
+
+    # Straight-line km where both completions are known, else minutes at the typical speed
+    lat = tour['completionLatitude'].where(tour['completionLatitude'] != 0)
+    lon = tour['completionLongitude'].where(tour['completionLongitude'] != 0)
+    km = leg_km(lat, lon)
+    kmh = km / np.where(minutes > 0, minutes / 60, np.nan)
+    typical_kmh = np.nanmedian(kmh) if np.isfinite(kmh).any() else DEFAULT_KMH
+    km = np.where(np.isfinite(km), km, minutes / 60 * typical_kmh)
+
+    if {'enteredClientArea', 'leftClientArea'} <= set(tour.columns):
+        service = (pd.to_datetime(tour['leftClientArea']) - pd.to_datetime(tour['enteredClientArea']))
+        service_minutes = float(service.dt.total_seconds().sum() / 60)
+    else:
+        service_minutes = 0.0
+
+    return {
+        'tour_no': tour_no,
+        'minutes': minutes,
+        'km': km,
+        'fuel_per_km': float(fuel_per_km.get(tour['truck'].iloc[0], fuel_per_km.median())),
+        'service_minutes': service_minutes,
+        'historical_order': np.arange(len(tour)),
+    }
+
+
+def score_sequences(sequences, minutes, km, fuel_per_km, service_minutes=0.0):
+    """
+    Score many candidate orderings at once. sequences is an (n_candidates,
+    n_stops) integer array of stop positions; every leg is gathered from the
+    precomputed matrices and summed per row.
+    """
+    sequences = np.atleast_2d(np.asarray(sequences, dtype=np.intp))
+    origins, destinations = sequences[:, :-1], sequences[:, 1:]
+
+    distance = km[origins, destinations].sum(axis=1)
+    duration = minutes[origins, destinations].sum(axis=1) + service_minutes
+
+    return pd.DataFrame({
+        'distance_km': distance,
+        'duration_minutes': duration,
+        'fuel': distance * fuel_per_km,
+    })
+
+
+def _score_tour(job):
+    """Worker entry point: score one tour's candidates"""
+    inputs, sequences = job
+    scores = score_sequences(sequences, inputs['minutes'], inputs['km'],
+                             inputs['fuel_per_km'], inputs['service_minutes'])
+    scores.insert(0, 'tourNo', inputs['tour_no'])
+    scores.insert(1, 'candidate', np.arange(len(scores)))
+    return scores
+
+
+def score_tours(jobs, max_workers=None):
+    """
+    Score candidates for many tours in parallel worker processes.
+    jobs is a list of (tour_inputs(...), sequences) pairs.
+    """
+    if len(jobs) == 1 or max_workers == 1:
+        results = [_score_tour(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_score_tour, jobs, chunksize=max(1, len(jobs) // 32)))
+    return pd.concat(results, ignore_index=True) if results else pd.DataFrame()
+
+
+def random_candidates(n_stops, n_candidates, seed=0):
+    """Random permutations of a tour's stops, with the historical order first"""
+    rng = np.random.default_rng(seed)
+    candidates = np.argsort(rng.random((n_candidates, n_stops)), axis=1)
+    candidates[0] = np.arange(n_stops)
+    return candidates
@@ -0,0 +1,206 @@
+import os
+import numpy as np
+import pandas as pd
+
+from .address_index import normalize_address
+from .gps_outlier_filter import haversine_m
+
+
+# Departure hour bins the travel times are split by
+HOUR_BINS = [0, 6, 9, 12, 15, 18, 24]
+
+# Trips longer than this are breaks or data errors, not travel
+MAX_TRIP_MINUTES = 180
+# Road distance is longer than the straight line between two stops
+DETOUR_FACTOR = 1.3
+
+DISPOSAL_PREFIX = 'disposal: '
+
+
+def hour_bin(hours):
+    """Index of the departure hour bin for each hour"""
+    return np.clip(np.searchsorted(HOUR_BINS, np.asarray(hours), 'right') - 1, 0, len(HOUR_BINS) - 2)
+
+
+def _time(df, col, fallback):
+    """A CW time column, or the fallback column where it is missing"""
+    values = pd.to_datetime(df[col], errors='coerce') if col in df.columns else pd.Series(pd.NaT, index=df.index)
+    return values.fillna(pd.to_datetime(df[fallback], errors='coerce'))
+
+
+def extract_visits(cw_df):
+    """
+    Stack client visits and disposal site visits of every CW row into one
+    table of (truck, stop, arrived, departed, latitude, longitude).
+    Exports without the client area columns fall back to the row's 'end'
+    (the completion time), so trips then include the service time.
+    """
+    clients = pd.DataFrame({
+        'truck': cw_df['truck'],
+        'stop': normalize_address(cw_df['clientAddress']),
+        'arrived': _time(cw_df, 'enteredClientArea', 'end'),
+        'departed': _time(cw_df, 'leftClientArea', 'end'),
+        'latitude': cw_df.get('completionLatitude'),
+        'longitude': cw_df.get('completionLongitude'),
+    })
+    clients = clients[cw_df['clientAddress'].notna()]
+
+    frames = [clients]
+    if {'disposalSite', 'enterDisposalSite', 'leaveDisposalSite'} <= set(cw_df.columns):
+        disposal = cw_df[cw_df['disposalSite'].notna() & cw_df['enterDisposalSite'].notna()]
+        frames.append(pd.DataFrame({
+            'truck': disposal['truck'],
+            'stop': DISPOSAL_PREFIX + disposal['disposalSite'].astype(str).str.strip(),
+            'arrived': pd.to_datetime(disposal['enterDisposalSite'], errors='coerce'),
+            'departed': pd.to_datetime(disposal['leaveDisposalSite'], errors='coerce'),
+            'latitude': np.nan,
+            'longitude': np.nan,
+        }))
+
+    visits = pd.concat(frames, ignore_index=True)
+    visits = visits.dropna(subset=['truck', 'arrived', 'departed'])
+    return visits.sort_values(['truck', 'arrived']).reset_index(drop=True)
+
+
+def extract_trips(visits):
+    """Consecutive visits of the same truck and day become one observed trip"""
+    nxt = visits.shift(-1)
+    same_day = ((visits['truck'] == nxt['truck']) &
+                (visits['arrived'].dt.date == nxt['arrived'].dt.date))
+    minutes = (nxt['arrived'] - visits['departed']).dt.total_seconds() / 60
+
+    trips = pd.DataFrame({
+        'origin': visits['stop'],
+        'destination': nxt['stop'],
+        'hour': visits['departed'].dt.hour + visits['departed'].dt.minute / 60,
+        'minutes': minutes,
+    })
+    valid = same_day & (minutes > 0) & (minutes <= MAX_TRIP_MINUTES) & (trips['origin'] != trips['destination'])
+    return trips[valid].reset_index(drop=True)
+
+
+class TravelTimeMatrix:
+    """
+    Observed median stop-to-stop travel minutes per departure hour bin, stored
+    sparsely by pair, with fallbacks for pairs and hours that were never seen
+    """
+
+    def __init__(self, stops, coords, pair_keys, pair_minutes, pair_counts, bin_minutes, bin_speed):
+        self.stops = np.asarray(stops, dtype=object)
+        self.coords = coords
+        self.pair_keys = pair_keys
+        self.pair_minutes = pair_minutes
+        self.pair_counts = pair_counts
+        self.bin_minutes = bin_minutes
+        self.bin_speed = bin_speed
+        self.stop_index = pd.Index(self.stops)
+
+    @classmethod
+    def from_cw(cls, cw_df):
+        """
+        Learn the matrix from historical CW rows. Only CW times are used, not
+        the event tracks: enteredClientArea/leftClientArea (and the disposal
+        site times) are geofence crossings already derived from those tracks,
+        so leaving one stop and entering the next is the door-to-door trip.
+        """
+        visits = extract_visits(cw_df)
+        trips = extract_trips(visits)
+        n_bins = len(HOUR_BINS) - 1
+
+        stops, codes = np.unique(visits['stop'].to_numpy(dtype=str), return_inverse=True)
+        coords = (visits.assign(code=codes).groupby('code')[['latitude', 'longitude']].median()
+                  .reindex(range(len(stops))).to_numpy(dtype=float))
+
+        stop_index = pd.Index(stops)
+        origin = stop_index.get_indexer(trips['origin'])
+        destination = stop_index.get_indexer(trips['destination'])
+        bins = hour_bin(trips['hour'])
+        trips = trips.assign(key=origin.astype(np.int64) * len(stops) + destination, bin=bins)
+
+        # Median per pair and hour bin, plus an all-day median for pairs seen at other hours
+        per_bin = trips.groupby(['key', 'bin'])['minutes'].median().unstack().reindex(columns=range(n_bins))
+        all_day = trips.groupby('key')['minutes'].median()
+        pair_minutes = per_bin.apply(lambda col: col.fillna(all_day)).to_numpy(dtype=np.float32)
+        pair_counts = trips.groupby('key').size().reindex(per_bin.index).to_numpy(dtype=np.int32)
+
+        bin_minutes = (trips.groupby('bin')['minutes'].median().reindex(range(n_bins))
+                       .fillna(trips['minutes'].median()).to_numpy(dtype=np.float32))
+
+        # Typical speed per hour bin from trips whose straight-line distance is known
+        km = haversine_m(coords[origin, 0], coords[origin, 1],
+                         coords[destination, 0], coords[destination, 1]) / 1000 * DETOUR_FACTOR
+        speed = pd.Series(km / (trips['minutes'].to_numpy() / 60)).replace([np.inf, 0], np.nan)
+        bin_speed = (speed.groupby(bins).median().reindex(range(n_bins))
+                     .fillna(speed.median()).to_numpy(dtype=np.float32))
+
+        print(f"Learned {len(per_bin):,} stop pairs from {len(trips):,} trips between {len(stops):,} stops")
+        return cls(stops, coords, per_bin.index.to_numpy(dtype=np.int64), pair_minutes, pair_counts,
+                   bin_minutes, bin_speed)
+
+    def stop_ids(self, stops):
+        """Matrix index of each stop label (normalised address or disposal site), -1 if unknown"""
+        return self.stop_index.get_indexer(pd.Series(stops, dtype=object))
+
+    def client_ids(self, addresses):
+        """Matrix index of each raw CW clientAddress"""
+        return self.stop_ids(normalize_address(pd.Series(addresses)))
+
+    def lookup(self, origins, destinations, hours):
+        """
+        Travel minutes for many (origin, destination, departure hour) at once.
+        Falls back from the observed pair median to a distance-based estimate
+        and finally to the median trip of that hour bin.
+        """
+        origins = np.asarray(origins, dtype=np.int64)
+        destinations = np.asarray(destinations, dtype=np.int64)
+        bins = np.broadcast_to(hour_bin(hours), origins.shape)
+
+        result = self.bin_minutes[bins].astype(float)
+
+        known = (origins >= 0) & (destinations >= 0)
+        o, d = np.where(known, origins, 0), np.where(known, destinations, 0)
+
+        km = haversine_m(self.coords[o, 0], self.coords[o, 1], self.coords[d, 0], self.coords[d, 1]) / 1000
+        estimate = km * DETOUR_FACTOR / self.bin_speed[bins] * 60
+        result = np.where(known & np.isfinite(estimate), estimate, result)
+
+        keys = o * len(self.stops) + d
+        if len(self.pair_keys):
+            pos = np.clip(np.searchsorted(self.pair_keys, keys), 0, len(self.pair_keys) - 1)
+            seen = known & (self.pair_keys[pos] == keys)
+            observed = self.pair_minutes[pos, bins]
+            result = np.where(seen & np.isfinite(observed), observed, result)
+
+        return np.where(known & (origins == destinations), 0.0, result)
+
+    def submatrix(self, stop_ids, hour):
+        """Dense minutes matrix between a handful of stops, e.g. one tour"""
+        stop_ids = np.asarray(stop_ids, dtype=np.int64)
+        o, d = np.meshgrid(stop_ids, stop_ids, indexing='ij')
+        return self.lookup(o, d, hour)
+
+    def save(self, path):
+        np.savez_compressed(path, stops=self.stops.astype(str), coords=self.coords,
+                            pair_keys=self.pair_keys, pair_minutes=self.pair_minutes,
+                            pair_counts=self.pair_counts, bin_minutes=self.bin_minutes,
+                            bin_speed=self.bin_speed)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        return cls(data['stops'], data['coords'], data['pair_keys'], data['pair_minutes'],
+                   data['pair_counts'], data['bin_minutes'], data['bin_speed'])
+
+
+def load_or_build_matrix(cw_df, cache_file=r'Output/travel_time_matrix.npz', source_file=None):
+    """
+    Load the cached matrix, or learn it from the CW data and cache it. With
+    source_file (the workbook cw_df was read from) a cache older than the
+    workbook is rebuilt.
+    """
+    if os.path.exists(cache_file) and (source_file is None or
+                                       os.path.getmtime(cache_file) >= os.path.getmtime(source_file)):
+        return TravelTimeMatrix.load(cache_file)
+    matrix = TravelTimeMatrix.from_cw(cw_df)
+    matrix.save(cache_file)
+    return matrix